@@ -1,14 +1,65 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, Any, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+
+from app.core.config import settings
+from app.core.responses import ServiceJSONResponse
+from app.core.security import get_token_claims
+from app.services.workout_periodization import generate_programs_in_worker, setup_worker
 
 router = APIRouter()
 
+# Upper bounds for one batch request
+MAX_BATCH_PROFILES = 100
+MAX_PROGRAM_WEEKS = 52
+
+class TrainingProfile(BaseModel):
+    """Profile fields read by the periodization engine; other fields pass through."""
+    model_config = ConfigDict(extra="allow")
+    
+    user_id: Optional[str] = None
+    experience_level: str = "beginner"
+    goal: str = "improve_fitness"
+    training_days_per_week: int = Field(3, ge=1, le=7)
+
+class ProgramBatchRequest(BaseModel):
+    """Profiles to generate programs for, sharing one program length."""
+    profiles: List[TrainingProfile] = Field(..., min_length=1, max_length=MAX_BATCH_PROFILES)
+    program_weeks: int = Field(12, ge=1, le=MAX_PROGRAM_WEEKS)
+
+def _program_pool(app: FastAPI) -> ProcessPoolExecutor:
+    """The app's program worker pool, started on first use."""
+    if app.state.program_pool is None:
+        # Each worker builds its own periodization engine
+        app.state.program_pool = ProcessPoolExecutor(
+            max_workers=settings.PROGRAM_POOL_WORKERS, initializer=setup_worker
+        )
+    return app.state.program_pool
+
 @router.post("/")
 async def create_program() -> Dict[str, Any]:
     """Create a new health and wellness program."""
     # TODO: Implement program creation logic
     return {"message": "Program creation endpoint - to be implemented"}
 
+@router.post("/batch", dependencies=[Depends(get_token_claims)])
+async def create_programs_batch(request: Request, batch: ProgramBatchRequest) -> ServiceJSONResponse:
+    """Generate workout programs for several users across the worker pool, in request order."""
+    pool = _program_pool(request.app)
+    profiles = [profile.model_dump() for profile in batch.profiles]
+    
+    # One chunk per worker, each generated with a single generate_programs_batch call
+    chunk_size = -(-len(profiles) // settings.PROGRAM_POOL_WORKERS)
+    chunks = await asyncio.gather(*(
+        asyncio.wrap_future(pool.submit(
+            generate_programs_in_worker, profiles[start:start + chunk_size], batch.program_weeks
+        ))
+        for start in range(0, len(profiles), chunk_size)
+    ))
+    return ServiceJSONResponse([program for chunk in chunks for program in chunk])
+
 @router.get("/{program_id}")
 async def get_program(program_id: str) -> Dict[str, Any]:
     """Get a specific program by ID."""
@@ -0,0 +1,12 @@
+"""
+Numba entry points for the service kernels, with plain-Python fallbacks when Numba is not installed.
+"""
+try:
+    from numba import njit, prange
+except ImportError:  # Kernels run as plain Python without Numba
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    
+    prange = range
@@ -31,3 +31,8 @@ def setup_logging() -> None:
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
+
+def info_enabled(stdlib_logger: logging.Logger) -> bool:
+    """Whether info events for ``stdlib_logger`` would be emitted, checked before building their fields."""
+    # Unconfigured structlog prints everything; setup_logging applies stdlib levels
+    return not structlog.is_configured() or stdlib_logger.isEnabledFor(logging.INFO)
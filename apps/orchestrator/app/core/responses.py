@@ -0,0 +1,23 @@
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize service objects with their own ``to_dict`` or as shallow field dicts."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if is_dataclass(obj):
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class ServiceJSONResponse(ORJSONResponse):
+    """orjson response that serializes service dataclasses without ``dataclasses.asdict``."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -3,33 +3,74 @@ Safety Regression Tests Service
 Validates PAR-Q screening, contraindications, and deload triggers for safety compliance.
 """
 import structlog
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass
-from enum import Enum
+import numpy as np
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+from dataclasses import dataclass, replace
+from enum import IntEnum
 import asyncio
 import json
-from dataclasses import asdict
+import time
+from collections import Counter, deque
 
 logger = structlog.get_logger()
 
-class TestType(Enum):
-    PAR_Q_SCREENING = "par_q_screening"
-    CONTRAINDICATIONS = "contraindications"
-    DELOAD_TRIGGERS = "deload_triggers"
-    SAFETY_GATES = "safety_gates"
+# Upper bound on results kept in memory by SafetyTestsService
+MAX_STORED_RESULTS = 100_000
 
-class TestStatus(Enum):
-    PASSED = "passed"
-    FAILED = "failed"
-    WARNING = "warning"
-    SKIPPED = "skipped"
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86_400 * _NS_PER_SECOND
 
-class RiskLevel(Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+# Bit position for each boolean PAR-Q answer
+_PARQ_FLAG_BITS = {
+    "chest_pain": 1 << 0,
+    "chest_pain_activity": 1 << 1,
+    "chest_pain_recent": 1 << 2,
+    "balance_problems": 1 << 3,
+    "bone_problems": 1 << 4,
+    "blood_pressure_meds": 1 << 5,
+    "other_reasons": 1 << 6,
+}
+
+def _pack_parq(parq_data: Dict[str, Any]) -> int:
+    """Pack the boolean PAR-Q answers into a single bitmask."""
+    mask = 0
+    for flag, bit in _PARQ_FLAG_BITS.items():
+        if parq_data.get(flag, False):
+            mask |= bit
+    return mask
+
+def _unpack_parq(mask: int, flag_mask: int) -> List[str]:
+    """Recover the flag names set in ``mask`` that belong to ``flag_mask``."""
+    return [flag for flag, bit in _PARQ_FLAG_BITS.items() if mask & flag_mask & bit]
+
+class _LabeledIntEnum(IntEnum):
+    """IntEnum whose members also carry the string label used for serialization."""
+    
+    def __new__(cls, code: int, label: str):
+        member = int.__new__(cls, code)
+        member._value_ = code
+        member.label = label
+        return member
+
+# Each enum owns its own block of codes so members of different enums never compare equal
+class TestType(_LabeledIntEnum):
+    PAR_Q_SCREENING = 100, "par_q_screening"
+    CONTRAINDICATIONS = 101, "contraindications"
+    DELOAD_TRIGGERS = 102, "deload_triggers"
+    SAFETY_GATES = 103, "safety_gates"
+
+class TestStatus(_LabeledIntEnum):
+    PASSED = 200, "passed"
+    FAILED = 201, "failed"
+    WARNING = 202, "warning"
+    SKIPPED = 203, "skipped"
+
+class RiskLevel(_LabeledIntEnum):
+    LOW = 300, "low"
+    MEDIUM = 301, "medium"
+    HIGH = 302, "high"
+    CRITICAL = 303, "critical"
 
 @dataclass
 class SafetyTestResult:
@@ -40,10 +81,58 @@ class SafetyTestResult:
     risk_level: RiskLevel
     description: str
     details: Dict[str, Any]
-    timestamp: datetime
+    timestamp: Optional[int]  # nanoseconds since the epoch; None only on templates
     user_id: Optional[str] = None
     program_id: Optional[str] = None
 
+# Constant fields of the common "passed" results; call sites stamp in the rest
+_PARQ_CRITICAL_PASS_TEMPLATE = SafetyTestResult(
+    test_type=TestType.PAR_Q_SCREENING,
+    test_name="Critical Health Flags",
+    status=TestStatus.PASSED,
+    risk_level=RiskLevel.LOW,
+    description="No critical health flags detected",
+    details={},
+    timestamp=None
+)
+
+_CONTRA_PASS_TEMPLATE = SafetyTestResult(
+    test_type=TestType.CONTRAINDICATIONS,
+    test_name="",
+    status=TestStatus.PASSED,
+    risk_level=RiskLevel.LOW,
+    description="",
+    details={},
+    timestamp=None
+)
+
+def _from_template(template: SafetyTestResult, **changes: Any) -> SafetyTestResult:
+    """Copy a template result, giving the copy its own ``details`` dict."""
+    if "details" not in changes:
+        changes["details"] = dict(template.details)
+    return replace(template, **changes)
+
+def _iso_from_ns(timestamp_ns: int) -> str:
+    """Format an epoch-nanosecond timestamp as an ISO 8601 UTC string."""
+    seconds, nanos = divmod(timestamp_ns, _NS_PER_SECOND)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(
+        microsecond=nanos // 1000
+    ).isoformat()
+
+def _to_dict(result: SafetyTestResult) -> Dict[str, Any]:
+    """Serialize a result without the deep-copy recursion of ``asdict``."""
+    return {
+        "test_type": result.test_type.label,
+        "test_name": result.test_name,
+        "status": result.status.label,
+        "risk_level": result.risk_level.label,
+        "description": result.description,
+        "details": result.details,
+        "timestamp": _iso_from_ns(result.timestamp),
+        "user_id": result.user_id,
+        "program_id": result.program_id,
+    }
+
 @dataclass
 class PARQTestData:
     """PAR-Q test data for validation."""
@@ -84,12 +173,37 @@ class SafetyTestsService:
     
     def __init__(self):
         self.logger = structlog.get_logger()
-        self.test_results: List[SafetyTestResult] = []
+        # Ring buffer: oldest results are evicted once the bound is reached
+        self.test_results: Deque[SafetyTestResult] = deque(maxlen=MAX_STORED_RESULTS)
+        
+        # Bumped on every mutation of test_results; guards the export cache
+        self._results_version = 0
+        self._export_cache: Optional[str] = None
+        self._export_cache_version = -1
         
         # Load test configurations
         self.parq_rules = self._load_parq_rules()
         self.contraindication_rules = self._load_contraindication_rules()
         self.deload_rules = self._load_deload_rules()
+        self._contraindication_index = self._build_contraindication_index()
+        
+        # Collect the high-risk medical conditions once so lookups are set membership tests
+        condition_risks = self.parq_rules["medical_condition_risks"]
+        self._high_risk_conditions = frozenset(
+            condition for condition, risk in condition_risks.items() if risk == "high"
+        )
+        
+        # Fold the PAR-Q flag lists into bitmasks for single AND tests
+        self._parq_critical_mask = self._flag_mask(self.parq_rules["critical_flags"])
+        self._parq_high_risk_mask = self._flag_mask(self.parq_rules["high_risk_flags"])
+    
+    @staticmethod
+    def _flag_mask(flags: List[str]) -> int:
+        """Combine PAR-Q flag names into a bitmask."""
+        mask = 0
+        for flag in flags:
+            mask |= _PARQ_FLAG_BITS[flag]
+        return mask
     
     def _load_parq_rules(self) -> Dict[str, Any]:
         """Load PAR-Q screening rules."""
@@ -145,6 +259,36 @@ class SafetyTestsService:
             }
         }
     
+    def _build_contraindication_index(self) -> Dict[str, Any]:
+        """Encode the contraindication mappings as packed exercise-by-factor bit matrices."""
+        rules = self.contraindication_rules
+        axes = {
+            "injuries": rules["injury_exercise_mapping"],
+            "conditions": rules["condition_exercise_mapping"],
+            "medications": rules["medication_exercise_mapping"],
+        }
+        exercise_names = sorted({
+            exercise
+            for mapping in axes.values()
+            for exercises in mapping.values()
+            for exercise in exercises
+        })
+        exercise_rows = {name: row for row, name in enumerate(exercise_names)}
+        
+        index: Dict[str, Any] = {"exercises": exercise_rows}
+        for axis, mapping in axes.items():
+            factors = list(mapping)
+            matrix = np.zeros((len(exercise_names), len(factors)), dtype=bool)
+            for column, factor in enumerate(factors):
+                for exercise in mapping[factor]:
+                    matrix[exercise_rows[exercise], column] = True
+            index[axis] = {
+                "factors": factors,
+                "columns": {factor: column for column, factor in enumerate(factors)},
+                "matrix": np.packbits(matrix, axis=1),
+            }
+        return index
+    
     def _load_deload_rules(self) -> Dict[str, Any]:
         """Load deload trigger rules."""
         return {
@@ -162,30 +306,42 @@ class SafetyTestsService:
         }
     
     async def run_all_safety_tests(self, user_id: str, program_id: str, 
-                                 test_data: Dict[str, Any]) -> List[SafetyTestResult]:
-        """Run all safety tests for a user."""
+                                 test_data: Dict[str, Any],
+                                 always_run_all: bool = False) -> List[SafetyTestResult]:
+        """Run all safety tests for a user.
+        
+        Fail-fast: a critical PAR-Q failure already blocks the program, so the
+        contraindication and deload suites are skipped and only the safety gate
+        runs. Pass ``always_run_all=True`` for audits that need the full battery.
+        """
         self.logger.info("Running safety tests", user_id=user_id, program_id=program_id)
         
         results = []
+        blocked = False
         
         # Run PAR-Q tests
         if "parq_data" in test_data:
             parq_results = await self.run_parq_tests(user_id, program_id, test_data["parq_data"])
             results.extend(parq_results)
-        
-        # Run contraindication tests
-        if "contraindication_data" in test_data:
-            contraindication_results = await self.run_contraindication_tests(
-                user_id, program_id, test_data["contraindication_data"]
+            blocked = not always_run_all and any(
+                result.risk_level is RiskLevel.CRITICAL and result.status is TestStatus.FAILED
+                for result in parq_results
             )
-            results.extend(contraindication_results)
         
-        # Run deload trigger tests
-        if "deload_data" in test_data:
-            deload_results = await self.run_deload_trigger_tests(
-                user_id, program_id, test_data["deload_data"]
-            )
-            results.extend(deload_results)
+        if not blocked:
+            # Run contraindication tests
+            if "contraindication_data" in test_data:
+                contraindication_results = await self.run_contraindication_tests(
+                    user_id, program_id, test_data["contraindication_data"]
+                )
+                results.extend(contraindication_results)
+            
+            # Run deload trigger tests
+            if "deload_data" in test_data:
+                deload_results = await self.run_deload_trigger_tests(
+                    user_id, program_id, test_data["deload_data"]
+                )
+                results.extend(deload_results)
         
         # Run safety gate tests
         safety_gate_results = await self.run_safety_gate_tests(user_id, program_id, results)
@@ -193,6 +349,7 @@ class SafetyTestsService:
         
         # Store results
         self.test_results.extend(results)
+        self._results_version += 1
         
         return results
     
@@ -200,15 +357,13 @@ class SafetyTestsService:
                            parq_data: Dict[str, Any]) -> List[SafetyTestResult]:
         """Run PAR-Q screening tests."""
         results = []
-        timestamp = datetime.now()
+        timestamp = time.time_ns()
         
-        # Test critical flags
-        critical_flags = []
-        for flag in self.parq_rules["critical_flags"]:
-            if parq_data.get(flag, False):
-                critical_flags.append(flag)
+        parq_mask = _pack_parq(parq_data)
         
-        if critical_flags:
+        # Test critical flags
+        if parq_mask & self._parq_critical_mask:
+            critical_flags = _unpack_parq(parq_mask, self._parq_critical_mask)
             results.append(SafetyTestResult(
                 test_type=TestType.PAR_Q_SCREENING,
                 test_name="Critical Health Flags",
@@ -224,12 +379,8 @@ class SafetyTestsService:
                 program_id=program_id
             ))
         else:
-            results.append(SafetyTestResult(
-                test_type=TestType.PAR_Q_SCREENING,
-                test_name="Critical Health Flags",
-                status=TestStatus.PASSED,
-                risk_level=RiskLevel.LOW,
-                description="No critical health flags detected",
+            results.append(_from_template(
+                _PARQ_CRITICAL_PASS_TEMPLATE,
                 details={"flags": []},
                 timestamp=timestamp,
                 user_id=user_id,
@@ -237,12 +388,8 @@ class SafetyTestsService:
             ))
         
         # Test high risk flags
-        high_risk_flags = []
-        for flag in self.parq_rules["high_risk_flags"]:
-            if parq_data.get(flag, False):
-                high_risk_flags.append(flag)
-        
-        if high_risk_flags:
+        if parq_mask & self._parq_high_risk_mask:
+            high_risk_flags = _unpack_parq(parq_mask, self._parq_high_risk_mask)
             results.append(SafetyTestResult(
                 test_type=TestType.PAR_Q_SCREENING,
                 test_name="High Risk Health Flags",
@@ -280,11 +427,12 @@ class SafetyTestsService:
         # Test medical conditions
         medical_conditions = parq_data.get("medical_conditions", [])
         high_risk_conditions = []
-        for condition in medical_conditions:
-            if condition in self.parq_rules["medical_condition_risks"]:
-                risk_level = self.parq_rules["medical_condition_risks"][condition]
-                if risk_level == "high":
-                    high_risk_conditions.append(condition)
+        if not self._high_risk_conditions.isdisjoint(medical_conditions):
+            # Preserve the user's ordering for stable descriptions
+            high_risk_conditions = [
+                condition for condition in medical_conditions
+                if condition in self._high_risk_conditions
+            ]
         
         if high_risk_conditions:
             results.append(SafetyTestResult(
@@ -308,7 +456,7 @@ class SafetyTestsService:
                                        contraindication_data: List[Dict[str, Any]]) -> List[SafetyTestResult]:
         """Run contraindication tests for exercises."""
         results = []
-        timestamp = datetime.now()
+        timestamp = time.time_ns()
         
         for exercise_data in contraindication_data:
             exercise_name = exercise_data["exercise_name"]
@@ -341,51 +489,124 @@ class SafetyTestsService:
                     if exercise_name in contraindicated_exercises:
                         medication_conflicts.append(medication)
             
-            # Determine overall risk level
-            total_conflicts = len(injury_conflicts) + len(condition_conflicts) + len(medication_conflicts)
+            results.append(self._contraindication_result(
+                user_id, program_id, exercise_name, timestamp,
+                injury_conflicts, condition_conflicts, medication_conflicts
+            ))
+        
+        return results
+    
+    async def run_contraindication_tests_batch(self, user_id: str, program_id: str,
+                                             exercises: List[str],
+                                             user_injuries: List[str],
+                                             user_conditions: List[str],
+                                             user_medications: List[str]) -> List[SafetyTestResult]:
+        """Run contraindication tests for many exercises against one user profile.
+        
+        Conflicts for every exercise are found with packed-bit ANDs against the
+        prebuilt contraindication matrices; only exercises with a hit go through
+        the per-name result path.
+        """
+        timestamp = time.time_ns()
+        index = self._contraindication_index
+        
+        # Exercises without any rule can never conflict
+        known = [
+            (position, index["exercises"][name])
+            for position, name in enumerate(exercises)
+            if name in index["exercises"]
+        ]
+        conflicts_by_position: Dict[int, List[List[str]]] = {}
+        
+        if known:
+            rows = np.fromiter((row for _, row in known), dtype=np.intp, count=len(known))
+            per_axis = []
+            for axis, user_values in (
+                ("injuries", user_injuries),
+                ("conditions", user_conditions),
+                ("medications", user_medications),
+            ):
+                axis_index = index[axis]
+                user_vector = np.zeros(len(axis_index["factors"]), dtype=bool)
+                for value in user_values:
+                    column = axis_index["columns"].get(value)
+                    if column is not None:
+                        user_vector[column] = True
+                hits = axis_index["matrix"][rows] & np.packbits(user_vector)
+                per_axis.append((axis_index, user_values, hits))
+            
+            any_hit = np.zeros(len(known), dtype=bool)
+            for _, _, hits in per_axis:
+                any_hit |= hits.any(axis=1)
             
-            if total_conflicts > 0:
-                risk_level = RiskLevel.HIGH if total_conflicts > 1 else RiskLevel.MEDIUM
-                status = TestStatus.FAILED if total_conflicts > 1 else TestStatus.WARNING
-                
-                results.append(SafetyTestResult(
-                    test_type=TestType.CONTRAINDICATIONS,
-                    test_name=f"Exercise Contraindication: {exercise_name}",
-                    status=status,
-                    risk_level=risk_level,
-                    description=f"Contraindications found for {exercise_name}",
-                    details={
-                        "exercise": exercise_name,
-                        "injury_conflicts": injury_conflicts,
-                        "condition_conflicts": condition_conflicts,
-                        "medication_conflicts": medication_conflicts,
-                        "total_conflicts": total_conflicts,
-                        "recommendation": "Consider exercise modification or substitution"
-                    },
-                    timestamp=timestamp,
-                    user_id=user_id,
-                    program_id=program_id
-                ))
-            else:
-                results.append(SafetyTestResult(
-                    test_type=TestType.CONTRAINDICATIONS,
-                    test_name=f"Exercise Contraindication: {exercise_name}",
-                    status=TestStatus.PASSED,
-                    risk_level=RiskLevel.LOW,
-                    description=f"No contraindications for {exercise_name}",
-                    details={"exercise": exercise_name},
-                    timestamp=timestamp,
-                    user_id=user_id,
-                    program_id=program_id
-                ))
+            # Only the rare conflicting rows are unpacked back into names
+            for row in np.flatnonzero(any_hit):
+                conflicts = []
+                for axis_index, user_values, hits in per_axis:
+                    factors = axis_index["factors"]
+                    hit_factors = {
+                        factors[column]
+                        for column in np.flatnonzero(np.unpackbits(hits[row], count=len(factors)))
+                    }
+                    # Report in the user's order, matching run_contraindication_tests
+                    conflicts.append([value for value in user_values if value in hit_factors])
+                conflicts_by_position[known[row][0]] = conflicts
+        
+        results = []
+        for position, exercise_name in enumerate(exercises):
+            conflicts = conflicts_by_position.get(position, ([], [], []))
+            results.append(self._contraindication_result(
+                user_id, program_id, exercise_name, timestamp, *conflicts
+            ))
         
         return results
     
+    def _contraindication_result(self, user_id: str, program_id: str, exercise_name: str,
+                                 timestamp: int, injury_conflicts: List[str],
+                                 condition_conflicts: List[str],
+                                 medication_conflicts: List[str]) -> SafetyTestResult:
+        """Build the contraindication result for one exercise from its conflicts."""
+        # Determine overall risk level
+        total_conflicts = len(injury_conflicts) + len(condition_conflicts) + len(medication_conflicts)
+        
+        if total_conflicts > 0:
+            risk_level = RiskLevel.HIGH if total_conflicts > 1 else RiskLevel.MEDIUM
+            status = TestStatus.FAILED if total_conflicts > 1 else TestStatus.WARNING
+            
+            return SafetyTestResult(
+                test_type=TestType.CONTRAINDICATIONS,
+                test_name=f"Exercise Contraindication: {exercise_name}",
+                status=status,
+                risk_level=risk_level,
+                description=f"Contraindications found for {exercise_name}",
+                details={
+                    "exercise": exercise_name,
+                    "injury_conflicts": injury_conflicts,
+                    "condition_conflicts": condition_conflicts,
+                    "medication_conflicts": medication_conflicts,
+                    "total_conflicts": total_conflicts,
+                    "recommendation": "Consider exercise modification or substitution"
+                },
+                timestamp=timestamp,
+                user_id=user_id,
+                program_id=program_id
+            )
+        
+        return _from_template(
+            _CONTRA_PASS_TEMPLATE,
+            test_name=f"Exercise Contraindication: {exercise_name}",
+            description=f"No contraindications for {exercise_name}",
+            details={"exercise": exercise_name},
+            timestamp=timestamp,
+            user_id=user_id,
+            program_id=program_id
+        )
+    
     async def run_deload_trigger_tests(self, user_id: str, program_id: str, 
                                      deload_data: Dict[str, Any]) -> List[SafetyTestResult]:
         """Run deload trigger tests."""
         results = []
-        timestamp = datetime.now()
+        timestamp = time.time_ns()
         
         # Test fatigue threshold
         fatigue_level = deload_data.get("fatigue_level", 5)
@@ -514,12 +735,12 @@ class SafetyTestsService:
                                   previous_results: List[SafetyTestResult]) -> List[SafetyTestResult]:
         """Run safety gate tests based on previous results."""
         results = []
-        timestamp = datetime.now()
+        timestamp = time.time_ns()
         
         # Check for critical failures
         critical_failures = [
             result for result in previous_results
-            if result.risk_level == RiskLevel.CRITICAL and result.status == TestStatus.FAILED
+            if result.risk_level is RiskLevel.CRITICAL and result.status is TestStatus.FAILED
         ]
         
         if critical_failures:
@@ -542,7 +763,7 @@ class SafetyTestsService:
         # Check for high risk warnings
         high_risk_warnings = [
             result for result in previous_results
-            if result.risk_level == RiskLevel.HIGH and result.status == TestStatus.WARNING
+            if result.risk_level is RiskLevel.HIGH and result.status is TestStatus.WARNING
         ]
         
         if high_risk_warnings:
@@ -564,7 +785,7 @@ class SafetyTestsService:
         
         # Check overall safety status
         total_tests = len(previous_results)
-        passed_tests = len([r for r in previous_results if r.status == TestStatus.PASSED])
+        passed_tests = len([r for r in previous_results if r.status is TestStatus.PASSED])
         safety_score = passed_tests / total_tests if total_tests > 0 else 1.0
         
         if safety_score >= 0.9:
@@ -634,23 +855,27 @@ class SafetyTestsService:
         # Group by test type
         results_by_type = {}
         for result in user_results:
-            test_type = result.test_type.value
+            test_type = result.test_type.label
             if test_type not in results_by_type:
                 results_by_type[test_type] = []
             results_by_type[test_type].append(result)
         
-        # Calculate statistics
+        # Serialize each result once; both views below share the dicts
+        serialized = {id(result): _to_dict(result) for result in user_results}
+        
+        # Calculate statistics in a single pass per attribute
+        status_counts = Counter(r.status for r in user_results)
+        risk_counts = Counter(r.risk_level for r in user_results)
+        
         total_tests = len(user_results)
-        passed_tests = len([r for r in user_results if r.status == TestStatus.PASSED])
-        failed_tests = len([r for r in user_results if r.status == TestStatus.FAILED])
-        warning_tests = len([r for r in user_results if r.status == TestStatus.WARNING])
+        passed_tests = status_counts[TestStatus.PASSED]
+        failed_tests = status_counts[TestStatus.FAILED]
+        warning_tests = status_counts[TestStatus.WARNING]
         
         # Risk level breakdown
-        risk_breakdown = {}
-        for risk_level in RiskLevel:
-            risk_breakdown[risk_level.value] = len([
-                r for r in user_results if r.risk_level == risk_level
-            ])
+        risk_breakdown = {
+            risk_level.label: risk_counts[risk_level] for risk_level in RiskLevel
+        }
         
         return {
             "user_id": user_id,
@@ -662,11 +887,11 @@ class SafetyTestsService:
             "safety_score": passed_tests / total_tests if total_tests > 0 else 0,
             "risk_breakdown": risk_breakdown,
             "results_by_type": {
-                test_type: [asdict(result) for result in results]
+                test_type: [serialized[id(result)] for result in results]
                 for test_type, results in results_by_type.items()
             },
             "latest_tests": [
-                asdict(result) for result in sorted(
+                serialized[id(result)] for result in sorted(
                     user_results, key=lambda x: x.timestamp, reverse=True
                 )[:10]
             ]
@@ -675,21 +900,28 @@ class SafetyTestsService:
     async def export_test_results(self, format: str = "json") -> str:
         """Export all test results."""
         if format == "json":
-            return json.dumps([asdict(result) for result in self.test_results], indent=2)
+            if self._export_cache_version != self._results_version:
+                self._export_cache = json.dumps(
+                    [_to_dict(result) for result in self.test_results], indent=2
+                )
+                self._export_cache_version = self._results_version
+            return self._export_cache
         else:
             raise ValueError(f"Unsupported export format: {format}")
     
     async def cleanup_old_results(self, days_to_keep: int = 90):
         """Clean up old test results."""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-        original_count = len(self.test_results)
+        cutoff_ns = time.time_ns() - days_to_keep * _NS_PER_DAY
+        removed_count = 0
         
-        self.test_results = [
-            result for result in self.test_results
-            if result.timestamp >= cutoff_date
-        ]
+        # Results are appended chronologically, so expired ones sit at the left
+        while self.test_results and self.test_results[0].timestamp < cutoff_ns:
+            self.test_results.popleft()
+            removed_count += 1
+        
+        if removed_count:
+            self._results_version += 1
         
-        removed_count = original_count - len(self.test_results)
         self.logger.info("Cleaned up old test results", 
                         removed_count=removed_count, 
                         remaining_count=len(self.test_results))
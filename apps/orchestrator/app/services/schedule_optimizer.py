@@ -3,13 +3,31 @@ Schedule Optimizer Service
 Optimizes workout and meal timing based on user preferences, device data, and scheduling constraints.
 """
 import structlog
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta, time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
+import heapq
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import logging
 import math
+import numpy as np
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:  # Solver is optional; the greedy scheduler is used without it
+    cp_model = None
+
+from ..core.jit import njit
+from ..core.logging import info_enabled
 
 logger = structlog.get_logger()
+_stdlib_logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
 
 class ActivityType(Enum):
     """Types of activities that can be scheduled."""
@@ -27,7 +45,106 @@ class TimeSlot(Enum):
     EVENING = "evening"              # 5-9 PM
     NIGHT = "night"                  # 9 PM-5 AM
 
-@dataclass
+# Time slots in index order, and the minute-of-day boundaries between them.
+# np.digitize maps minutes before 5 AM to 0 and after 9 PM to 5; both are night.
+_SLOT_ORDER = (
+    TimeSlot.EARLY_MORNING,
+    TimeSlot.MORNING,
+    TimeSlot.AFTERNOON,
+    TimeSlot.EVENING,
+    TimeSlot.NIGHT,
+)
+_SLOT_BOUNDARY_MINUTES = np.array([5, 8, 12, 17, 21]) * 60
+_SLOT_FOR_DIGIT = np.array([4, 0, 1, 2, 3, 4])
+
+# Device sleep quality is reported on a 1-10 scale
+_SLEEP_QUALITY_SCALE = 10.0
+
+# Patterns used for slots without device data
+_DEFAULT_ENERGY_PATTERNS = {
+    'early_morning': 0.6,
+    'morning': 0.8,
+    'afternoon': 0.7,
+    'evening': 0.5,
+    'night': 0.3
+}
+_DEFAULT_SLEEP_PATTERNS = {
+    'early_morning': 0.7,
+    'morning': 0.9,
+    'afternoon': 0.6,
+    'evening': 0.4,
+    'night': 0.2
+}
+
+_TITLES = {
+    ActivityType.WORKOUT: "Workout Session",
+    ActivityType.MEAL: "Meal Time",
+    ActivityType.HABIT: "Habit Check-in",
+    ActivityType.MINDSET: "Mindset Practice",
+    ActivityType.SLEEP: "Sleep Preparation"
+}
+
+@njit
+def _spacing_ok(candidate, starts, alive, spacing_minutes):
+    """Check that no other live slot starts within ``spacing_minutes`` of a slot.
+    
+    ``starts`` is ascending, so only the neighbours inside the window are visited.
+    """
+    candidate_start = starts[candidate]
+    low = np.searchsorted(starts, candidate_start - spacing_minutes, side='right')
+    high = np.searchsorted(starts, candidate_start + spacing_minutes, side='left')
+    for i in range(low, high):
+        if i != candidate and alive[i]:
+            return False
+    return True
+
+@njit
+def _score_slots(slot_codes, days, preferred_code):
+    """Score slots by time slot code (index into _SLOT_ORDER) and weekday."""
+    scores = np.empty(len(slot_codes), dtype=np.float64)
+    for i in range(len(slot_codes)):
+        score = 0.5
+        if slot_codes[i] == preferred_code:
+            score += 0.3
+        if days[i] <= 5:
+            score += 0.2
+        if slot_codes[i] == 0 and preferred_code != 0:
+            score -= 0.1
+        scores[i] = max(0.0, min(1.0, score))
+    return scores
+
+@lru_cache(maxsize=1024)
+def _compile_week_template(first_weekday: int, rest_days: frozenset, preferred_code: int,
+                           slot_ranges: Tuple[Tuple[TimeSlot, int, int], ...]) -> Tuple[tuple, ...]:
+    """Lay out a week's candidate slots before existing activities are considered.
+    
+    Each entry is ``(day_offset, day_of_week, time_slot, slot_code, start_min,
+    end_min, available_duration, score)``. The layout depends only on the week's first
+    weekday and the user's rest days and preferred workout time, so it is
+    shared across weeks and re-optimizations.
+    """
+    entries = []
+    for day_offset in range(7):
+        day_of_week = (first_weekday - 1 + day_offset) % 7 + 1
+        # Skip rest days for workouts
+        if day_of_week in rest_days:
+            continue
+        for slot_type, start_minutes, end_minutes in slot_ranges:
+            # Overnight slots end the next day
+            available_duration = (end_minutes - start_minutes) % MINUTES_PER_DAY
+            entries.append((day_offset, day_of_week, slot_type, _SLOT_ORDER.index(slot_type),
+                            start_minutes, end_minutes, available_duration))
+    
+    if not entries:
+        return ()
+    scores = _score_slots(
+        np.array([entry[3] for entry in entries], dtype=np.int8),
+        np.array([entry[1] for entry in entries], dtype=np.int8),
+        preferred_code,
+    )
+    return tuple(entry + (score,) for entry, score in zip(entries, scores.tolist()))
+
+@dataclass(slots=True)
 class ScheduleConstraint:
     """Represents a scheduling constraint."""
     id: str
@@ -41,8 +158,25 @@ class ScheduleConstraint:
     must_have_spacing_hours: int = 0  # Minimum hours between activities
     flexible_timing: bool = True
     created_at: datetime = None
+    
+    @property
+    def preferred_days_mask(self) -> int:
+        """Preferred days as a bitmask; bit ``day - 1`` is set for each day."""
+        mask = 0
+        for day in self.preferred_days:
+            if 1 <= day <= 7:
+                mask |= 1 << (day - 1)
+        return mask
+    
+    @property
+    def preferred_slots_mask(self) -> int:
+        """Preferred time slots as a bitmask over their ``_SLOT_ORDER`` positions."""
+        mask = 0
+        for time_slot in self.preferred_time_slots:
+            mask |= 1 << _SLOT_ORDER.index(time_slot)
+        return mask
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledActivity:
     """Represents a scheduled activity."""
     id: str
@@ -58,7 +192,7 @@ class ScheduledActivity:
     priority: int
     metadata: Dict[str, Any] = None
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleOptimization:
     """Result of schedule optimization."""
     user_id: str
@@ -69,7 +203,7 @@ class ScheduleOptimization:
     adherence_score: float  # 0-1, how well the schedule fits constraints
     created_at: datetime = None
 
-@dataclass
+@dataclass(slots=True)
 class UserPreferences:
     """User scheduling preferences."""
     user_id: str
@@ -83,11 +217,38 @@ class UserPreferences:
     timezone: str = "UTC"
     created_at: datetime = None
 
+@dataclass(slots=True)
+class ScheduleRequest:
+    """Inputs for one user's weekly optimization in a batch."""
+    user_id: str
+    week_start: datetime
+    constraints: List[ScheduleConstraint]
+    preferences: UserPreferences
+    existing_activities: List[ScheduledActivity] = None
+
+@dataclass(slots=True)
+class _Slot:
+    """A candidate time slot in the week being scheduled."""
+    index: int
+    date: datetime
+    day_of_week: int
+    time_slot: TimeSlot
+    slot_code: int  # Position of time_slot in _SLOT_ORDER
+    start_min: int
+    end_min: int
+    week_min: int  # Start in minutes from week start
+    available_duration: int
+    score: float = 0.0
+
 class ScheduleOptimizer:
     """Service for optimizing user schedules based on preferences and constraints."""
     
+    # CP-SAT only runs when greedy leaves conflicts; keep it to one thread and a short search
+    CP_SAT_WORKERS = 1
+    CP_SAT_TIME_LIMIT_SECONDS = 0.05
+    MAX_CACHED_OPTIMIZATIONS = 10_000
+    
     def __init__(self):
-        self.logger = structlog.get_logger()
         self.time_slot_ranges = {
             TimeSlot.EARLY_MORNING: (time(5, 0), time(8, 0)),
             TimeSlot.MORNING: (time(8, 0), time(12, 0)),
@@ -95,33 +256,151 @@ class ScheduleOptimizer:
             TimeSlot.EVENING: (time(17, 0), time(21, 0)),
             TimeSlot.NIGHT: (time(21, 0), time(5, 0))
         }
+        # Same ranges as minutes since midnight; all slot arithmetic uses these
+        self.time_slot_ranges_min = {
+            slot_type: (start.hour * 60 + start.minute, end.hour * 60 + end.minute)
+            for slot_type, (start, end) in self.time_slot_ranges.items()
+        }
+        self._slot_ranges = tuple(
+            (slot_type, start, end) for slot_type, (start, end) in self.time_slot_ranges_min.items()
+        )
+        # Finished optimizations keyed by a digest of their inputs, least recent first
+        self._optimization_cache: OrderedDict[bytes, ScheduleOptimization] = OrderedDict()
     
     def optimize_schedule(self, user_id: str, week_start: datetime, 
                          constraints: List[ScheduleConstraint],
                          preferences: UserPreferences,
                          existing_activities: List[ScheduledActivity] = None) -> ScheduleOptimization:
         """Optimize schedule for a given week."""
-        self.logger.info("Starting schedule optimization", user_id=user_id, week_start=week_start)
+        log_enabled = info_enabled(_stdlib_logger)
+        if log_enabled:
+            logger.info("Starting schedule optimization", user_id=user_id, week_start=week_start)
         
         if existing_activities is None:
             existing_activities = []
         
+        # The key covers every input, so a changed constraint or preference misses
+        cache_key = hashlib.blake2b(
+            repr((user_id, week_start, constraints, preferences, existing_activities)).encode(),
+            digest_size=16,
+        ).digest()
+        cached = self._optimization_cache.get(cache_key)
+        if cached is not None:
+            self._optimization_cache.move_to_end(cache_key)
+            if log_enabled:
+                logger.info("Schedule optimization served from cache", user_id=user_id)
+            return self._copy_optimization(cached, created_at=datetime.utcnow())
+        
         # Sort constraints by priority (highest first)
         sorted_constraints = sorted(constraints, key=lambda x: x.priority, reverse=True)
         
+        # Generate all possible time slots for the week
+        occupied = self._build_occupancy(existing_activities, week_start)
+        available_slots, slot_index = self._generate_available_slots(
+            week_start, preferences, occupied
+        )
+        
+        # Greedy places everything in the common case; CP-SAT only searches
+        # for a better packing when some instances were left unplaced
+        scheduled_activities, conflicts = self._schedule_greedy(
+            sorted_constraints, available_slots, slot_index, preferences
+        )
+        if conflicts:
+            solution = self._solve_cp_model(sorted_constraints, available_slots, week_start, existing_activities)
+            if solution is not None and self._placed_priority(solution[0]) > self._placed_priority(scheduled_activities):
+                scheduled_activities, conflicts = solution
+        
+        # Calculate adherence score
+        adherence_score = self._calculate_adherence_score(scheduled_activities, constraints, preferences)
+        
+        # Generate recommendations
+        recommendations = self._generate_recommendations(scheduled_activities, constraints, conflicts, preferences)
+        
+        optimization = ScheduleOptimization(
+            user_id=user_id,
+            week_start=week_start,
+            scheduled_activities=scheduled_activities,
+            conflicts=conflicts,
+            recommendations=recommendations,
+            adherence_score=adherence_score,
+            created_at=datetime.utcnow()
+        )
+        
+        self._optimization_cache[cache_key] = self._copy_optimization(optimization)
+        if len(self._optimization_cache) > self.MAX_CACHED_OPTIMIZATIONS:
+            self._optimization_cache.popitem(last=False)
+        
+        if log_enabled:
+            logger.info("Schedule optimization completed", 
+                        user_id=user_id, 
+                        activities_scheduled=len(scheduled_activities),
+                        conflicts=len(conflicts),
+                        adherence_score=adherence_score)
+        
+        return optimization
+    
+    def optimize_schedules_batch(self, requests: List[ScheduleRequest],
+                                 executor: Optional[Executor] = None) -> List[ScheduleOptimization]:
+        """Optimize many users' weeks across worker processes, in request order.
+        
+        Runs on ``executor`` when given, otherwise on a process pool shared by
+        all batch calls and started on first use, so workers stay warm between
+        batches. A single request runs in this process.
+        """
+        if len(requests) <= 1:
+            return [_optimize_request(self, request) for request in requests]
+        
+        if executor is None:
+            executor = _shared_batch_pool()
+        return list(executor.map(_optimize_one, requests, chunksize=16))
+    
+    def _copy_optimization(self, optimization: ScheduleOptimization, **changes) -> ScheduleOptimization:
+        """Copy an optimization down to its activities, their metadata and its conflicts.
+        
+        Cached results share nothing mutable with the copies handed to callers.
+        """
+        return replace(
+            optimization,
+            scheduled_activities=[
+                replace(activity, metadata=None if activity.metadata is None else dict(activity.metadata))
+                for activity in optimization.scheduled_activities
+            ],
+            conflicts=[dict(conflict) for conflict in optimization.conflicts],
+            recommendations=list(optimization.recommendations),
+            **changes
+        )
+    
+    def _schedule_greedy(self, sorted_constraints: List[ScheduleConstraint],
+                         available_slots: List[_Slot],
+                         slot_index: Dict[Tuple[int, TimeSlot], List[_Slot]],
+                         preferences: UserPreferences) -> Tuple[List[ScheduledActivity], List[Dict[str, Any]]]:
+        """Schedule activities one at a time in priority order."""
         scheduled_activities = []
         conflicts = []
         
-        # Generate all possible time slots for the week
-        available_slots = self._generate_available_slots(week_start, preferences, existing_activities)
+        # Slot starts in minutes from week start, indexed like slot.index;
+        # slots are generated in time order, so the starts are ascending.
+        # Taken slots are tombstoned in slot_alive instead of being removed.
+        slot_starts = np.array([slot.week_min for slot in available_slots], dtype=np.int32)
+        slot_alive = np.ones(len(available_slots), dtype=np.bool_)
+        
+        # Constraints sharing a window and duration share one candidate list
+        candidate_groups = {}
         
         # Schedule activities based on priority
         for constraint in sorted_constraints:
+            group_key = (constraint.preferred_days_mask,
+                         constraint.preferred_slots_mask,
+                         constraint.duration_minutes)
+            candidates = candidate_groups.get(group_key)
+            if candidates is None:
+                candidates = candidate_groups[group_key] = self._group_candidates(*group_key, slot_index)
+            
             activities_scheduled = 0
             required_activities = constraint.frequency_per_week
             
             while activities_scheduled < required_activities:
-                best_slot = self._find_best_slot(constraint, available_slots, preferences)
+                best_slot = self._find_best_slot(constraint, candidates, slot_starts, slot_alive)
                 
                 if best_slot:
                     # Create scheduled activity
@@ -129,170 +408,300 @@ class ScheduleOptimizer:
                     scheduled_activities.append(activity)
                     
                     # Update available slots
-                    self._update_available_slots(available_slots, best_slot, constraint.duration_minutes)
+                    self._update_available_slots(
+                        slot_index, slot_alive, best_slot, constraint.duration_minutes
+                    )
                     
                     activities_scheduled += 1
                 else:
                     # No suitable slot found
-                    conflicts.append({
-                        'constraint_id': constraint.id,
-                        'activity_type': constraint.activity_type.value,
-                        'reason': 'No suitable time slot available',
-                        'priority': constraint.priority
-                    })
+                    conflicts.append(self._unscheduled_conflict(constraint))
                     break
         
-        # Calculate adherence score
-        adherence_score = self._calculate_adherence_score(scheduled_activities, constraints, preferences)
-        
-        # Generate recommendations
-        recommendations = self._generate_recommendations(scheduled_activities, constraints, conflicts, preferences)
+        return scheduled_activities, conflicts
+    
+    def _placed_priority(self, scheduled_activities: List[ScheduledActivity]) -> int:
+        """Total priority of the placed activities, the measure CP-SAT maximizes first."""
+        return sum(activity.priority for activity in scheduled_activities)
+    
+    def _unscheduled_conflict(self, constraint: ScheduleConstraint) -> Dict[str, Any]:
+        """Describe a constraint whose weekly frequency could not be met."""
+        return {
+            'constraint_id': constraint.id,
+            'activity_type': constraint.activity_type.value,
+            'reason': 'No suitable time slot available',
+            'priority': constraint.priority
+        }
+    
+    def _solve_cp_model(self, sorted_constraints: List[ScheduleConstraint],
+                        available_slots: List[_Slot], week_start: datetime,
+                        existing_activities: List[ScheduledActivity]
+                        ) -> Optional[Tuple[List[ScheduledActivity], List[Dict[str, Any]]]]:
+        """Solve the weekly schedule with CP-SAT.
+        
+        Returns None when OR-Tools is not installed or no solution is found in
+        the time limit, so the caller keeps the greedy schedule.
+        """
+        if cp_model is None:
+            return None
         
-        optimization = ScheduleOptimization(
-            user_id=user_id,
-            week_start=week_start,
-            scheduled_activities=scheduled_activities,
-            conflicts=conflicts,
-            recommendations=recommendations,
-            adherence_score=adherence_score,
-            created_at=datetime.utcnow()
+        model, placements = self._build_cp_model(
+            sorted_constraints, available_slots, week_start, existing_activities
         )
         
-        self.logger.info("Schedule optimization completed", 
-                        user_id=user_id, 
-                        activities_scheduled=len(scheduled_activities),
-                        conflicts=len(conflicts),
-                        adherence_score=adherence_score)
+        solver = cp_model.CpSolver()
+        solver.parameters.num_search_workers = self.CP_SAT_WORKERS
+        solver.parameters.max_time_in_seconds = self.CP_SAT_TIME_LIMIT_SECONDS
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
         
-        return optimization
+        scheduled_activities = []
+        conflicts = []
+        for constraint in sorted_constraints:
+            chosen = sorted(
+                (start, slot) for slot, start, literal in placements.get(constraint.id, [])
+                if solver.BooleanValue(literal)
+            )
+            for _, slot in chosen:
+                scheduled_activities.append(self._create_scheduled_activity(constraint, slot))
+            if len(chosen) < constraint.frequency_per_week:
+                conflicts.append(self._unscheduled_conflict(constraint))
+        
+        return scheduled_activities, conflicts
     
-    def _generate_available_slots(self, week_start: datetime, preferences: UserPreferences, 
-                                 existing_activities: List[ScheduledActivity]) -> List[Dict[str, Any]]:
-        """Generate available time slots for the week."""
-        slots = []
+    def _build_cp_model(self, sorted_constraints: List[ScheduleConstraint],
+                        available_slots: List[_Slot], week_start: datetime,
+                        existing_activities: List[ScheduledActivity]) -> Tuple[Any, Dict[str, List[Tuple]]]:
+        """Build the CP-SAT model for a week.
+        
+        Each required activity instance is an optional interval whose start is
+        one of the constraint's eligible slots. All intervals, plus the fixed
+        existing activities, share one no-overlap constraint. The objective
+        rewards placing high-priority instances first and preferred slots second.
+        """
+        model = cp_model.CpModel()
+        horizon = 8 * MINUTES_PER_DAY  # Night slots may run past the end of the week
+        intervals = []
+        objective_terms = []
+        placements: Dict[str, List[Tuple]] = {}
         
-        for day_offset in range(7):
-            current_date = week_start + timedelta(days=day_offset)
-            day_of_week = current_date.isoweekday()
-            
-            # Skip rest days for workouts
-            if day_of_week in preferences.rest_days:
+        for constraint in sorted_constraints:
+            days_mask = constraint.preferred_days_mask
+            slots_mask = constraint.preferred_slots_mask
+            candidates = [
+                slot for slot in available_slots
+                if ((slots_mask >> slot.slot_code) & 1 and
+                    (days_mask >> (slot.day_of_week - 1)) & 1 and
+                    slot.available_duration >= constraint.duration_minutes)
+            ]
+            if not candidates:
                 continue
             
-            # Generate slots for each time period
-            for slot_type, (start_time, end_time) in self.time_slot_ranges.items():
-                # Check if this slot conflicts with existing activities
-                if not self._has_conflict(current_date, start_time, end_time, existing_activities):
-                    slots.append({
-                        'date': current_date,
-                        'day_of_week': day_of_week,
-                        'time_slot': slot_type,
-                        'start_time': start_time,
-                        'end_time': end_time,
-                        'available_duration': self._calculate_available_duration(start_time, end_time, preferences),
-                        'score': self._calculate_slot_score(slot_type, day_of_week, preferences)
-                    })
-        
-        return slots
-    
-    def _find_best_slot(self, constraint: ScheduleConstraint, available_slots: List[Dict[str, Any]], 
-                       preferences: UserPreferences) -> Optional[Dict[str, Any]]:
-        """Find the best available slot for a constraint."""
-        suitable_slots = []
-        
-        for slot in available_slots:
-            # Check if slot meets constraint requirements
-            if (slot['time_slot'] in constraint.preferred_time_slots and
-                slot['day_of_week'] in constraint.preferred_days and
-                slot['available_duration'] >= constraint.duration_minutes):
+            starts = [self._week_minutes(slot.date, slot.start_min, week_start) for slot in candidates]
+            scores = [int(round(slot.score * 100)) for slot in candidates]
+            spacing = max(constraint.must_have_spacing_hours * 60, 1)
+            placements[constraint.id] = []
+            previous = None
+            
+            for instance in range(constraint.frequency_per_week):
+                name = f"{constraint.id}_{instance}"
+                present = model.NewBoolVar(f"{name}_present")
+                start = model.NewIntVar(0, horizon, f"{name}_start")
+                intervals.append(model.NewOptionalFixedSizeIntervalVar(
+                    start, constraint.duration_minutes, present, f"{name}_interval"
+                ))
+                
+                choices = [model.NewBoolVar(f"{name}_slot_{i}") for i in range(len(candidates))]
+                model.Add(sum(choices) == present)
+                model.Add(start == sum(value * choice for value, choice in zip(starts, choices)))
                 
-                # Check spacing requirements
-                if self._meets_spacing_requirements(slot, constraint, available_slots):
-                    suitable_slots.append(slot)
+                # Instances of a constraint are placed in order, which breaks
+                # symmetry and turns pairwise spacing into a chain
+                if previous is not None:
+                    previous_start, previous_present = previous
+                    model.AddImplication(present, previous_present)
+                    model.Add(start >= previous_start + spacing).OnlyEnforceIf(present)
+                previous = (start, present)
+                
+                objective_terms.append(constraint.priority * 1000 * present)
+                for slot, value, score, choice in zip(candidates, starts, scores, choices):
+                    objective_terms.append(constraint.priority * score * choice)
+                    placements[constraint.id].append((slot, value, choice))
+        
+        # Existing activities cover the same minutes as in _build_occupancy
+        for index, activity in enumerate(existing_activities):
+            start_of_day = activity.start_time.hour * 60 + activity.start_time.minute
+            end_of_day = activity.end_time.hour * 60 + activity.end_time.minute
+            start = self._week_minutes(activity.scheduled_date, start_of_day, week_start)
+            end = start + (end_of_day - start_of_day) % MINUTES_PER_DAY
+            start, end = max(start, 0), min(end, horizon)
+            if start < end:
+                intervals.append(model.NewFixedSizeIntervalVar(start, end - start, f"existing_{index}"))
+        
+        model.AddNoOverlap(intervals)
+        model.Maximize(sum(objective_terms))
+        return model, placements
+    
+    def _week_minutes(self, date: datetime, start_minutes: int, week_start: datetime) -> int:
+        """Minutes from the start of the week to ``start_minutes`` on ``date``."""
+        day_offset = (date.date() - week_start.date()).days
+        return day_offset * MINUTES_PER_DAY + start_minutes
+    
+    def _iter_slots(self, week_start: datetime, preferences: UserPreferences,
+                    occupied: int) -> Iterator[_Slot]:
+        """Yield the week's slots that are free of existing activities, in time order."""
+        template = _compile_week_template(
+            week_start.isoweekday(),
+            frozenset(preferences.rest_days),
+            _SLOT_ORDER.index(preferences.preferred_workout_time),
+            self._slot_ranges,
+        )
+        week_dates = [week_start + timedelta(days=day_offset) for day_offset in range(7)]
+        index = 0
+        
+        for (day_offset, day_of_week, slot_type, slot_code,
+             start_minutes, end_minutes, available_duration, score) in template:
+            week_minutes = day_offset * MINUTES_PER_DAY + start_minutes
+            # Check if this slot conflicts with existing activities
+            if self._has_conflict(week_minutes, available_duration, occupied):
+                continue
+            yield _Slot(
+                index=index,
+                date=week_dates[day_offset],
+                day_of_week=day_of_week,
+                time_slot=slot_type,
+                slot_code=slot_code,
+                start_min=start_minutes,
+                end_min=end_minutes,
+                week_min=week_minutes,
+                available_duration=available_duration,
+                score=score,
+            )
+            index += 1
+    
+    def _generate_available_slots(self, week_start: datetime, preferences: UserPreferences, 
+                                 occupied: int
+                                 ) -> Tuple[List[_Slot], Dict[Tuple[int, TimeSlot], List[_Slot]]]:
+        """Generate available time slots for the week.
+        
+        Returns the slots in generation order together with an index mapping
+        ``(day_of_week, time_slot)`` to its slots. A week holds each weekday
+        once, so every bucket has at most one slot and needs no ordering.
+        """
+        slots = []
+        slot_index = defaultdict(list)
         
-        if not suitable_slots:
-            return None
+        for slot in self._iter_slots(week_start, preferences, occupied):
+            slots.append(slot)
+            slot_index[(slot.day_of_week, slot.time_slot)].append(slot)
         
-        # Sort by score and return the best one
-        suitable_slots.sort(key=lambda x: x['score'], reverse=True)
-        return suitable_slots[0]
+        return slots, slot_index
+    
+    def _group_candidates(self, days_mask: int, slots_mask: int, duration_minutes: int,
+                          slot_index: Dict[Tuple[int, TimeSlot], List[_Slot]]) -> List[_Slot]:
+        """Collect the slots long enough for a window, best score first.
+        
+        Each bucket is trivially ordered, so they are merged rather than sorted.
+        """
+        buckets = [
+            slot_index.get((day_of_week, time_slot), ())
+            for day_of_week in range(1, 8) if (days_mask >> (day_of_week - 1)) & 1
+            for slot_code, time_slot in enumerate(_SLOT_ORDER) if (slots_mask >> slot_code) & 1
+        ]
+        return [
+            slot
+            for slot in heapq.merge(*buckets, key=lambda x: (-x.score, x.index))
+            if slot.available_duration >= duration_minutes
+        ]
     
-    def _create_scheduled_activity(self, constraint: ScheduleConstraint, slot: Dict[str, Any]) -> ScheduledActivity:
+    def _find_best_slot(self, constraint: ScheduleConstraint, candidates: List[_Slot],
+                       slot_starts: np.ndarray, slot_alive: np.ndarray) -> Optional[_Slot]:
+        """Find the best available slot for a constraint.
+        
+        Candidates are ordered best first, so the first live slot that meets
+        the spacing requirement wins; ties go to the earliest generated slot.
+        """
+        for slot in candidates:
+            if slot_alive[slot.index] and self._meets_spacing_requirements(slot, constraint, slot_starts, slot_alive):
+                return slot
+        
+        return None
+    
+    def _create_scheduled_activity(self, constraint: ScheduleConstraint, slot: _Slot) -> ScheduledActivity:
         """Create a scheduled activity from a constraint and slot."""
-        start_time = slot['start_time']
-        end_time = self._calculate_end_time(start_time, constraint.duration_minutes)
+        start_minutes = slot.start_min
         
         # Generate title based on activity type
         title = self._generate_activity_title(constraint.activity_type)
         
         return ScheduledActivity(
-            id=f"activity_{constraint.id}_{slot['date'].strftime('%Y%m%d')}",
+            id=f"activity_{constraint.id}_{slot.date.strftime('%Y%m%d')}",
             user_id=constraint.user_id,
             activity_type=constraint.activity_type,
             title=title,
             description=f"Scheduled {constraint.activity_type.value}",
-            scheduled_date=slot['date'],
-            start_time=start_time,
-            end_time=end_time,
+            scheduled_date=slot.date,
+            start_time=self._minutes_to_time(start_minutes),
+            end_time=self._minutes_to_time(start_minutes + constraint.duration_minutes),
             duration_minutes=constraint.duration_minutes,
             constraint_id=constraint.id,
             priority=constraint.priority,
             metadata={
-                'time_slot': slot['time_slot'].value,
-                'day_of_week': slot['day_of_week']
+                'time_slot': slot.time_slot.value,
+                'day_of_week': slot.day_of_week
             }
         )
     
-    def _update_available_slots(self, available_slots: List[Dict[str, Any]], 
-                              used_slot: Dict[str, Any], duration_minutes: int):
-        """Update available slots after scheduling an activity."""
-        used_date = used_slot['date']
-        used_start = used_slot['start_time']
-        used_end = self._calculate_end_time(used_start, duration_minutes)
-        
-        # Remove or update conflicting slots
-        slots_to_remove = []
-        for slot in available_slots:
-            if (slot['date'] == used_date and
-                self._times_overlap(used_start, used_end, slot['start_time'], slot['end_time'])):
-                slots_to_remove.append(slot)
-        
-        for slot in slots_to_remove:
-            available_slots.remove(slot)
+    def _update_available_slots(self, slot_index: Dict[Tuple[int, TimeSlot], List[_Slot]],
+                              slot_alive: np.ndarray, used_slot: _Slot, duration_minutes: int):
+        """Tombstone the slots that overlap a newly scheduled activity."""
+        used_start = used_slot.start_min
+        used_end = used_start + duration_minutes
+        
+        # Within one week a weekday identifies the date, so only its buckets can overlap
+        for slot_type in _SLOT_ORDER:
+            for slot in slot_index.get((used_slot.day_of_week, slot_type), ()):
+                slot_end = slot.start_min + slot.available_duration  # Night slots run past midnight
+                if used_start < slot_end and slot.start_min < used_end:
+                    slot_alive[slot.index] = False
     
     def _calculate_adherence_score(self, scheduled_activities: List[ScheduledActivity], 
                                  constraints: List[ScheduleConstraint],
                                  preferences: UserPreferences) -> float:
-        """Calculate how well the schedule adheres to constraints and preferences."""
+        """Calculate how well the schedule adheres to constraints and preferences.
+        
+        Each constraint scores the fraction of its weekly frequency that was
+        scheduled plus 0.1 per activity in a preferred time slot, capped at 1.
+        """
         if not constraints:
             return 1.0
         
-        total_score = 0
-        max_score = len(constraints)
-        
+        # Activities per constraint id and time slot; the last column counts unknown slots
+        id_rows = {}
         for constraint in constraints:
-            constraint_activities = [a for a in scheduled_activities if a.constraint_id == constraint.id]
-            
-            if len(constraint_activities) >= constraint.frequency_per_week:
-                # Full adherence
-                score = 1.0
-            elif len(constraint_activities) > 0:
-                # Partial adherence
-                score = len(constraint_activities) / constraint.frequency_per_week
-            else:
-                # No adherence
-                score = 0.0
-            
-            # Bonus for preferred timing
-            timing_bonus = 0
-            for activity in constraint_activities:
-                if activity.metadata.get('time_slot') in [ts.value for ts in constraint.preferred_time_slots]:
-                    timing_bonus += 0.1
-            
-            score = min(1.0, score + timing_bonus)
-            total_score += score
-        
-        return total_score / max_score if max_score > 0 else 0.0
+            id_rows.setdefault(constraint.id, len(id_rows))
+        slot_columns = {slot.value: column for column, slot in enumerate(_SLOT_ORDER)}
+        counts = np.zeros((len(id_rows), len(_SLOT_ORDER) + 1), dtype=np.int32)
+        for activity in scheduled_activities:
+            row = id_rows.get(activity.constraint_id)
+            if row is not None:
+                column = slot_columns.get(activity.metadata.get('time_slot'), len(_SLOT_ORDER))
+                counts[row, column] += 1
+        
+        preferred = np.zeros((len(constraints), len(_SLOT_ORDER) + 1), dtype=np.bool_)
+        for row, constraint in enumerate(constraints):
+            for time_slot in constraint.preferred_time_slots:
+                preferred[row, _SLOT_ORDER.index(time_slot)] = True
+        
+        constraint_counts = counts[[id_rows[constraint.id] for constraint in constraints]]
+        got = constraint_counts.sum(axis=1)
+        timing_matches = (constraint_counts * preferred).sum(axis=1)
+        needed = np.array([constraint.frequency_per_week for constraint in constraints])
+        
+        scores = np.where(got >= needed, 1.0, got / np.maximum(needed, 1))
+        scores = np.minimum(1.0, scores + 0.1 * timing_matches)
+        return float(scores.mean())
     
     def _generate_recommendations(self, scheduled_activities: List[ScheduledActivity], 
                                 constraints: List[ScheduleConstraint],
@@ -309,119 +718,81 @@ class ScheduleOptimizer:
                     "High-priority activities couldn't be scheduled. Consider adjusting your availability or reducing activity frequency."
                 )
         
-        # Check for rest day distribution
+        # Tally workout days, morning workouts and meals in one pass
         workout_days = set()
+        morning_workouts = 0
+        meal_activities = 0
+        noon = time(12, 0)
         for activity in scheduled_activities:
-            if activity.activity_type == ActivityType.WORKOUT:
+            if activity.activity_type is ActivityType.WORKOUT:
                 workout_days.add(activity.scheduled_date.isoweekday())
+                if activity.start_time < noon:
+                    morning_workouts += 1
+            elif activity.activity_type is ActivityType.MEAL:
+                meal_activities += 1
         
+        # Check for rest day distribution
         if len(workout_days) < 3:
             recommendations.append(
                 "Consider spreading workouts across more days for better recovery and consistency."
             )
         
         # Check for timing preferences
-        morning_workouts = [a for a in scheduled_activities 
-                          if a.activity_type == ActivityType.WORKOUT and 
-                          a.start_time < time(12, 0)]
-        
-        if preferences.preferred_workout_time == TimeSlot.MORNING and len(morning_workouts) < 2:
+        if preferences.preferred_workout_time == TimeSlot.MORNING and morning_workouts < 2:
             recommendations.append(
                 "Try to schedule more workouts in the morning to match your preferences."
             )
         
         # Check for meal spacing
-        meal_activities = [a for a in scheduled_activities if a.activity_type == ActivityType.MEAL]
-        if len(meal_activities) < 3:
+        if meal_activities < 3:
             recommendations.append(
                 "Ensure you have time for regular meals throughout the day."
             )
         
         return recommendations
     
-    def _has_conflict(self, date: datetime, start_time: time, end_time: time, 
-                     existing_activities: List[ScheduledActivity]) -> bool:
-        """Check if a time slot conflicts with existing activities."""
-        for activity in existing_activities:
-            if (activity.scheduled_date.date() == date.date() and
-                self._times_overlap(start_time, end_time, activity.start_time, activity.end_time)):
-                return True
-        return False
-    
-    def _times_overlap(self, start1: time, end1: time, start2: time, end2: time) -> bool:
-        """Check if two time ranges overlap."""
-        return start1 < end2 and start2 < end1
-    
-    def _calculate_available_duration(self, start_time: time, end_time: time, 
-                                    preferences: UserPreferences) -> int:
-        """Calculate available duration in a time slot."""
-        start_minutes = start_time.hour * 60 + start_time.minute
-        end_minutes = end_time.hour * 60 + end_time.minute
-        
-        # Handle overnight slots
-        if end_minutes < start_minutes:
-            end_minutes += 24 * 60
-        
-        return end_minutes - start_minutes
-    
-    def _calculate_slot_score(self, time_slot: TimeSlot, day_of_week: int, 
-                            preferences: UserPreferences) -> float:
-        """Calculate a score for a time slot based on preferences."""
-        score = 0.5  # Base score
-        
-        # Prefer morning workouts
-        if time_slot == preferences.preferred_workout_time:
-            score += 0.3
+    def _build_occupancy(self, existing_activities: List[ScheduledActivity], week_start: datetime) -> int:
+        """Mark the minutes of the week taken by existing activities.
         
-        # Prefer weekdays for workouts
-        if day_of_week <= 5:  # Monday-Friday
-            score += 0.2
+        Bit ``n`` of the result is set when minute ``n`` from the start of the
+        week's first day is occupied. Activities ending before they start run
+        past midnight, and an eighth day holds night slots spilling past the week.
+        """
+        occupied = 0
+        first_day = week_start.date()
+        horizon = 8 * MINUTES_PER_DAY
         
-        # Avoid very early morning unless specifically preferred
-        if time_slot == TimeSlot.EARLY_MORNING and preferences.preferred_workout_time != TimeSlot.EARLY_MORNING:
-            score -= 0.1
-        
-        return max(0.0, min(1.0, score))
+        for activity in existing_activities:
+            start_of_day = activity.start_time.hour * 60 + activity.start_time.minute
+            end_of_day = activity.end_time.hour * 60 + activity.end_time.minute
+            start = (activity.scheduled_date.date() - first_day).days * MINUTES_PER_DAY + start_of_day
+            end = start + (end_of_day - start_of_day) % MINUTES_PER_DAY
+            start, end = max(start, 0), min(end, horizon)
+            if start < end:
+                occupied |= ((1 << (end - start)) - 1) << start
+        
+        return occupied
     
-    def _meets_spacing_requirements(self, slot: Dict[str, Any], constraint: ScheduleConstraint, 
-                                  available_slots: List[Dict[str, Any]]) -> bool:
+    def _has_conflict(self, week_minutes: int, duration_minutes: int, occupied: int) -> bool:
+        """Check if the minutes a slot covers overlap existing activities."""
+        return (occupied >> week_minutes) & ((1 << duration_minutes) - 1) != 0
+    
+    def _meets_spacing_requirements(self, slot: _Slot, constraint: ScheduleConstraint, 
+                                  slot_starts: np.ndarray, slot_alive: np.ndarray) -> bool:
         """Check if a slot meets spacing requirements from other activities."""
         if constraint.must_have_spacing_hours == 0:
             return True
         
-        slot_datetime = datetime.combine(slot['date'], slot['start_time'])
-        
-        # Check spacing from other scheduled activities
-        for other_slot in available_slots:
-            if other_slot != slot:
-                other_datetime = datetime.combine(other_slot['date'], other_slot['start_time'])
-                time_diff = abs((slot_datetime - other_datetime).total_seconds() / 3600)
-                
-                if time_diff < constraint.must_have_spacing_hours:
-                    return False
-        
-        return True
+        return bool(_spacing_ok(slot.index, slot_starts, slot_alive,
+                                float(constraint.must_have_spacing_hours * 60)))
     
-    def _calculate_end_time(self, start_time: time, duration_minutes: int) -> time:
-        """Calculate end time given start time and duration."""
-        start_minutes = start_time.hour * 60 + start_time.minute
-        end_minutes = start_minutes + duration_minutes
-        
-        hours = end_minutes // 60
-        minutes = end_minutes % 60
-        
-        return time(hours, minutes)
+    def _minutes_to_time(self, minutes: int) -> time:
+        """Convert minutes since midnight to a ``time``, wrapping past midnight."""
+        return time(*divmod(minutes % MINUTES_PER_DAY, 60))
     
     def _generate_activity_title(self, activity_type: ActivityType) -> str:
         """Generate a title for an activity based on its type."""
-        titles = {
-            ActivityType.WORKOUT: "Workout Session",
-            ActivityType.MEAL: "Meal Time",
-            ActivityType.HABIT: "Habit Check-in",
-            ActivityType.MINDSET: "Mindset Practice",
-            ActivityType.SLEEP: "Sleep Preparation"
-        }
-        return titles.get(activity_type, "Scheduled Activity")
+        return _TITLES.get(activity_type, "Scheduled Activity")
     
     def suggest_schedule_adjustments(self, optimization: ScheduleOptimization, 
                                    user_feedback: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -467,8 +838,9 @@ class ScheduleOptimizer:
                                  preferences: UserPreferences) -> Dict[str, Any]:
         """Determine optimal workout timing based on device data and preferences."""
         # Analyze device data for patterns
-        energy_patterns = self._analyze_energy_patterns(device_data)
-        sleep_patterns = self._analyze_sleep_patterns(device_data)
+        device_arrays = self._device_data_to_arrays(device_data)
+        energy_patterns = self._analyze_energy_patterns(device_arrays)
+        sleep_patterns = self._analyze_sleep_patterns(device_arrays)
         
         # Find time slots with highest energy and best sleep recovery
         optimal_slots = []
@@ -500,26 +872,113 @@ class ScheduleOptimizer:
             'reasoning': f"Based on your energy patterns and sleep data, {optimal_slots[0]['time_slot']} appears to be your optimal workout time."
         }
     
-    def _analyze_energy_patterns(self, device_data: List[Dict[str, Any]]) -> Dict[str, float]:
-        """Analyze energy patterns from device data."""
-        # This would analyze heart rate, activity levels, etc.
-        # For now, return default patterns
+    def _device_data_to_arrays(self, device_data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Extract device samples into parallel arrays in a single pass.
+        
+        Missing readings are stored as NaN so each signal can be aggregated
+        independently over the same rows. Samples without a timestamp cannot be
+        placed in a time slot and are skipped.
+        """
+        device_data = [sample for sample in device_data if sample.get('timestamp') is not None]
+        count = len(device_data)
+        minutes_of_day = np.empty(count, dtype=np.int32)
+        heart_rate = np.full(count, np.nan)
+        steps = np.full(count, np.nan)
+        sleep_quality = np.full(count, np.nan)
+        
+        for row, sample in enumerate(device_data):
+            timestamp = sample['timestamp']
+            if isinstance(timestamp, str):
+                timestamp = datetime.fromisoformat(timestamp)
+            minutes_of_day[row] = timestamp.hour * 60 + timestamp.minute
+            if sample.get('heart_rate') is not None:
+                heart_rate[row] = sample['heart_rate']
+            if sample.get('steps') is not None:
+                steps[row] = sample['steps']
+            if sample.get('sleep_quality') is not None:
+                sleep_quality[row] = sample['sleep_quality'] / _SLEEP_QUALITY_SCALE
+        
         return {
-            'early_morning': 0.6,
-            'morning': 0.8,
-            'afternoon': 0.7,
-            'evening': 0.5,
-            'night': 0.3
+            'slot': _SLOT_FOR_DIGIT[np.digitize(minutes_of_day, _SLOT_BOUNDARY_MINUTES)],
+            'heart_rate': heart_rate,
+            'steps': steps,
+            'sleep_quality': sleep_quality,
         }
     
-    def _analyze_sleep_patterns(self, device_data: List[Dict[str, Any]]) -> Dict[str, float]:
-        """Analyze sleep patterns from device data."""
-        # This would analyze sleep quality, recovery, etc.
-        # For now, return default patterns
-        return {
-            'early_morning': 0.7,
-            'morning': 0.9,
-            'afternoon': 0.6,
-            'evening': 0.4,
-            'night': 0.2
-        }
+    def _slot_means(self, slot: np.ndarray, values: np.ndarray,
+                    defaults: Dict[str, float]) -> Dict[str, float]:
+        """Average ``values`` per time slot, keeping ``defaults`` for slots without data."""
+        present = ~np.isnan(values)
+        counts = np.bincount(slot[present], minlength=len(_SLOT_ORDER))
+        totals = np.bincount(slot[present], weights=values[present], minlength=len(_SLOT_ORDER))
+        
+        patterns = dict(defaults)
+        for index in np.flatnonzero(counts):
+            patterns[_SLOT_ORDER[index].value] = float(totals[index] / counts[index])
+        return patterns
+    
+    def _normalize(self, values: np.ndarray) -> np.ndarray:
+        """Min-max scale a signal to 0-1, leaving NaN readings untouched."""
+        if np.all(np.isnan(values)):
+            return values
+        low = np.nanmin(values)
+        span = np.nanmax(values) - low
+        if span == 0:
+            return np.where(np.isnan(values), np.nan, 0.5)
+        return (values - low) / span
+    
+    def _analyze_energy_patterns(self, device_arrays: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """Analyze energy patterns from device data.
+        
+        Energy for a sample is the mean of its normalized heart rate and step
+        count; slots without samples keep the default pattern.
+        """
+        signals = np.vstack([
+            self._normalize(device_arrays['heart_rate']),
+            self._normalize(device_arrays['steps']),
+        ])
+        # Average whichever signals each sample has; rows with neither stay NaN
+        present = ~np.isnan(signals)
+        counts = present.sum(axis=0)
+        totals = np.where(present, signals, 0.0).sum(axis=0)
+        energy = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+        return self._slot_means(device_arrays['slot'], energy, _DEFAULT_ENERGY_PATTERNS)
+    
+    def _analyze_sleep_patterns(self, device_arrays: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """Analyze sleep patterns from device data.
+        
+        Sleep quality, rescaled from 1-10 to 0-1 like the default pattern, is
+        averaged per time slot; slots without samples keep the default pattern.
+        """
+        return self._slot_means(device_arrays['slot'], device_arrays['sleep_quality'], _DEFAULT_SLEEP_PATTERNS)
+
+# Optimizer owned by a batch worker process, created by its initializer
+_worker_optimizer: Optional[ScheduleOptimizer] = None
+
+# Process pool reused by optimize_schedules_batch calls without an executor
+_batch_pool: Optional[ProcessPoolExecutor] = None
+
+def setup_worker() -> None:
+    """Build the schedule optimizer once per worker process."""
+    global _worker_optimizer
+    _worker_optimizer = ScheduleOptimizer()
+
+def _shared_batch_pool() -> ProcessPoolExecutor:
+    """The shared batch pool, started on first use with one worker per CPU."""
+    global _batch_pool
+    if _batch_pool is None:
+        _batch_pool = ProcessPoolExecutor(initializer=setup_worker)
+    return _batch_pool
+
+def _optimize_request(optimizer: ScheduleOptimizer, request: ScheduleRequest) -> ScheduleOptimization:
+    """Run one batch request through an optimizer."""
+    return optimizer.optimize_schedule(
+        request.user_id, request.week_start, request.constraints,
+        request.preferences, request.existing_activities
+    )
+
+def _optimize_one(request: ScheduleRequest) -> ScheduleOptimization:
+    """Optimize a batch request in a worker process."""
+    if _worker_optimizer is None:
+        setup_worker()
+    return _optimize_request(_worker_optimizer, request)
@@ -3,13 +3,190 @@ TDEE & Macro Calculation Engine
 Deterministic algorithms for calculating Total Daily Energy Expenditure and macro targets.
 """
 import structlog
-from typing import Dict, Any, List, Tuple
+import logging
+from typing import Dict, Any, List, Sequence, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache, wraps
+import numpy as np
+
+from ..core.jit import njit
+from ..core.logging import info_enabled
 
 logger = structlog.get_logger()
+_stdlib_logger = logging.getLogger(__name__)
+
+# Columns of the weekly macro rows produced by _weekly_macro_rows
+_KCAL, _PROTEIN, _CARBS, _FAT, _FIBER, _WATER, _REFEED = range(7)
+
+@njit
+def _weekly_macro_rows(program_weeks, base_kcal, kcal_multipliers, deload, base_protein_g,
+                       protein_ratio, fat_ratio, base_fiber, base_water, activity_water, refeed_period):
+    """Compute one row of macro targets per program week.
+    
+    ``kcal_multipliers`` holds the multipliers for weeks 1-4, 5-8 and 9+.
+    Deload applies a further 10% cut every 4th week, and a ``refeed_period``
+    of 0 means no refeed weeks.
+    """
+    rows = np.zeros((program_weeks, 7), dtype=np.int64)
+    for index in range(program_weeks):
+        week = index + 1
+        kcal = int(base_kcal * kcal_multipliers[min((week - 1) // 4, 2)])
+        if deload and week % 4 == 0:
+            kcal = int(kcal * 0.9)  # 10% reduction for deload
+        
+        # Protein, fat and carbs in one pass; kcal is non-negative so floor division truncates like int()
+        protein_g = max(base_protein_g, int((kcal * protein_ratio) // 4))  # 4 kcal per gram
+        fat_g = int((kcal * fat_ratio) // 9)  # 9 kcal per gram
+        carbs_g = max(0, (kcal - protein_g * 4 - fat_g * 9) // 4)  # Remainder, in integer arithmetic
+        
+        rows[index, _KCAL] = kcal
+        rows[index, _PROTEIN] = protein_g
+        rows[index, _CARBS] = carbs_g
+        rows[index, _FAT] = fat_g
+        rows[index, _FIBER] = min(base_fiber + int(carbs_g * 0.1), 50)  # Cap at 50g
+        rows[index, _WATER] = int(base_water + activity_water + int(kcal * 0.5))
+        rows[index, _REFEED] = refeed_period > 0 and week % refeed_period == 0
+    return rows
+
+@njit
+def _weekly_macro_rows_batch(program_weeks, base_kcal, kcal_multipliers, deload, base_protein_g,
+                             protein_ratio, fat_ratio, base_fiber, base_water, activity_water, refeed_period):
+    """Stack ``_weekly_macro_rows`` for many users; every argument but ``program_weeks`` is per user."""
+    rows = np.zeros((len(base_kcal), program_weeks, 7), dtype=np.int64)
+    for user in range(len(base_kcal)):
+        rows[user] = _weekly_macro_rows(
+            program_weeks, base_kcal[user], kcal_multipliers[user], deload[user], base_protein_g[user],
+            protein_ratio[user], fat_ratio[user], base_fiber[user], base_water[user], activity_water[user],
+            refeed_period[user],
+        )
+    return rows
+
+class ActivityLevel(IntEnum):
+    """Activity levels, coded to index the per-level tables."""
+    SEDENTARY = 0
+    LIGHT = 1
+    MODERATE = 2
+    ACTIVE = 3
+    VERY_ACTIVE = 4
+
+class Goal(IntEnum):
+    """Program goals, coded to index the per-goal tables."""
+    LOSE_WEIGHT = 0
+    LOSE_WEIGHT_AGGRESSIVE = 1
+    GAIN_MUSCLE = 2
+    MAINTAIN = 3
+    IMPROVE_FITNESS = 4
+    SPORTS_PERFORMANCE = 5
+
+class ExperienceLevel(IntEnum):
+    """Training experience levels, coded to index the per-level tables."""
+    BEGINNER = 0
+    INTERMEDIATE = 1
+    ADVANCED = 2
+
+def _log_errors(event: str):
+    """Log ``event`` with the profile's user id when the wrapped engine method raises."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, profile: Dict[str, Any], *args, **kwargs):
+            try:
+                return method(self, profile, *args, **kwargs)
+            except Exception as e:
+                logger.error(event, 
+                            user_id=profile.get("user_id"),
+                            error=str(e))
+                raise
+        return wrapper
+    return decorator
+
+_CODES_BY_NAME = {
+    codes: {member.name.lower(): member for member in codes}
+    for codes in (ActivityLevel, Goal, ExperienceLevel)
+}
+
+def _parse_code(codes: type, value: Any, default: IntEnum) -> IntEnum:
+    """Map a profile string such as ``"very_active"`` to its code, or ``default`` if unknown."""
+    if isinstance(value, codes):
+        return value
+    return _CODES_BY_NAME[codes].get(value, default)
+
+_LOSS_GOALS = (Goal.LOSE_WEIGHT, Goal.LOSE_WEIGHT_AGGRESSIVE)
+
+# Activity level multipliers (Mifflin-St Jeor), indexed by ActivityLevel
+_ACTIVITY_MULTIPLIERS = (
+    1.2,      # Sedentary: little to no exercise
+    1.375,    # Light: exercise 1-3 days/week
+    1.55,     # Moderate: exercise 3-5 days/week
+    1.725,    # Active: hard exercise 6-7 days/week
+    1.9,      # Very active: very hard exercise, physical job
+)
+
+# Goal-based calorie adjustments, indexed by Goal
+_GOAL_ADJUSTMENTS = (
+    -500,     # Lose weight: 0.5kg/week loss
+    -750,     # Lose weight aggressively: 0.75kg/week loss
+    300,      # Gain muscle: 0.3kg/week gain
+    0,        # Maintain
+    -200,     # Improve fitness: slight deficit for recomposition
+    100,      # Sports performance: slight surplus for performance
+)
+
+# Macro ratios by goal as (protein, carbs, fat) rows, indexed by Goal
+_MACRO_RATIOS = (
+    (0.35, 0.35, 0.30),
+    (0.40, 0.30, 0.30),
+    (0.30, 0.45, 0.25),
+    (0.30, 0.40, 0.30),
+    (0.30, 0.40, 0.30),
+    (0.25, 0.50, 0.25),
+)
+
+# Calorie multipliers for weeks 1-4, 5-8 and 9+, indexed by Goal then ExperienceLevel;
+# goals without periodization keep base calories
+_DEFICITS = tuple((1 - 0.1 * factor, 1 - 0.15 * factor, 1 - 0.2 * factor) for factor in (0.8, 1.0, 1.2))
+_SURPLUSES = tuple((1 + 0.05 * factor, 1 + 0.1 * factor, 1 + 0.15 * factor) for factor in (0.8, 1.0, 1.2))
+_FLAT = ((1.0, 1.0, 1.0),) * len(ExperienceLevel)
+_KCAL_PERIODIZATION = np.array((_DEFICITS, _DEFICITS, _SURPLUSES, _FLAT, _FLAT, _FLAT))
+_KCAL_PERIODIZATION.flags.writeable = False
+
+# Share of weekly calories from protein and fat, indexed by Goal
+_PROTEIN_FAT_RATIOS = ((0.35, 0.30), (0.35, 0.30), (0.30, 0.25), (0.30, 0.30), (0.30, 0.30), (0.30, 0.30))
+
+# Protein needs in g/kg bodyweight, indexed by Goal
+_PROTEIN_G_PER_KG = (2.2, 2.2, 2.0, 1.8, 1.8, 1.8)
+
+# Additional water and sodium for activity, indexed by ActivityLevel
+_ACTIVITY_WATER = (0, 500, 1000, 1500, 2000)
+_ACTIVITY_SODIUM = (0, 0, 0, 500, 500)
+
+@lru_cache(maxsize=4096)
+def _calculate_tdee(age: float, weight_kg: float, height_cm: float, sex: str,
+                    activity_level: ActivityLevel, goal: Goal) -> Tuple[int, int, float, int, int]:
+    """Compute (bmr, tdee, activity_multiplier, goal_adjustment, final_target); memoized on the exact inputs."""
+    # Calculate BMR using Mifflin-St Jeor equation
+    if sex == "male":
+        bmr = (10 * weight_kg) + (6.25 * height_cm) - (5 * age) + 5
+    else:
+        bmr = (10 * weight_kg) + (6.25 * height_cm) - (5 * age) - 161
+    
+    bmr = int(bmr)
+    
+    # Apply activity multiplier
+    activity_multiplier = _ACTIVITY_MULTIPLIERS[activity_level]
+    tdee = int(bmr * activity_multiplier)
+    
+    # Apply goal-based adjustment
+    goal_adjustment = _GOAL_ADJUSTMENTS[goal]
+    
+    # Ensure minimum safe calorie intake
+    min_calories = 1200 if sex == "female" else 1500
+    final_target = max(tdee + goal_adjustment, min_calories)
+    
+    return bmr, tdee, activity_multiplier, goal_adjustment, final_target
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MacroTargets:
     """Macro targets for a specific period."""
     kcal: int
@@ -21,7 +198,7 @@ class MacroTargets:
     water_ml: int
     refeed: bool = False
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TDEEProfile:
     """TDEE calculation results."""
     bmr: int  # Basal Metabolic Rate
@@ -33,36 +210,7 @@ class TDEEProfile:
 class TDEEMacroEngine:
     """Engine for calculating TDEE and macro targets."""
     
-    def __init__(self):
-        # Activity level multipliers (Mifflin-St Jeor)
-        self.activity_multipliers = {
-            'sedentary': 1.2,      # Little to no exercise
-            'light': 1.375,        # Light exercise 1-3 days/week
-            'moderate': 1.55,      # Moderate exercise 3-5 days/week
-            'active': 1.725,       # Hard exercise 6-7 days/week
-            'very_active': 1.9,    # Very hard exercise, physical job
-        }
-        
-        # Goal-based calorie adjustments
-        self.goal_adjustments = {
-            'lose_weight': -500,      # 0.5kg/week loss
-            'lose_weight_aggressive': -750,  # 0.75kg/week loss
-            'gain_muscle': 300,       # 0.3kg/week gain
-            'maintain': 0,
-            'improve_fitness': -200,  # Slight deficit for recomposition
-            'sports_performance': 100,  # Slight surplus for performance
-        }
-        
-        # Macro ratios by goal
-        self.macro_ratios = {
-            'lose_weight': {'protein': 0.35, 'carbs': 0.35, 'fat': 0.30},
-            'lose_weight_aggressive': {'protein': 0.40, 'carbs': 0.30, 'fat': 0.30},
-            'gain_muscle': {'protein': 0.30, 'carbs': 0.45, 'fat': 0.25},
-            'maintain': {'protein': 0.30, 'carbs': 0.40, 'fat': 0.30},
-            'improve_fitness': {'protein': 0.30, 'carbs': 0.40, 'fat': 0.30},
-            'sports_performance': {'protein': 0.25, 'carbs': 0.50, 'fat': 0.25},
-        }
-    
+    @_log_errors("TDEE calculation failed")
     def calculate_tdee(self, profile: Dict[str, Any]) -> TDEEProfile:
         """
         Calculate Total Daily Energy Expenditure using Mifflin-St Jeor equation.
@@ -73,67 +221,99 @@ class TDEEMacroEngine:
         Returns:
             TDEEProfile with BMR, TDEE, and final target
         """
-        logger.info("Calculating TDEE", user_id=profile.get("user_id"))
+        log_enabled = info_enabled(_stdlib_logger)
+        if log_enabled:
+            logger.info("Calculating TDEE", user_id=profile.get("user_id"))
         
-        try:
-            # Extract profile data
-            age = profile.get("age")
-            weight_kg = profile.get("weight_kg")
-            height_cm = profile.get("height_cm")
-            sex = profile.get("sex_at_birth")
-            activity_level = profile.get("activity_level", "moderate")
-            goal = profile.get("goal", "maintain")
-            
-            if not all([age, weight_kg, height_cm, sex]):
-                raise ValueError("Missing required profile data for TDEE calculation")
-            
-            # Calculate BMR using Mifflin-St Jeor equation
-            if sex == "male":
-                bmr = (10 * weight_kg) + (6.25 * height_cm) - (5 * age) + 5
-            else:
-                bmr = (10 * weight_kg) + (6.25 * height_cm) - (5 * age) - 161
-            
-            bmr = int(bmr)
-            
-            # Apply activity multiplier
-            activity_multiplier = self.activity_multipliers.get(activity_level, 1.55)
-            tdee = int(bmr * activity_multiplier)
-            
-            # Apply goal-based adjustment
-            goal_adjustment = self.goal_adjustments.get(goal, 0)
-            final_target = tdee + goal_adjustment
-            
-            # Ensure minimum safe calorie intake
-            min_calories = 1200 if sex == "female" else 1500
-            if final_target < min_calories:
-                logger.warning("Target calories below minimum, adjusting", 
-                             user_id=profile.get("user_id"),
-                             target=final_target,
-                             min_calories=min_calories)
-                final_target = min_calories
-            
-            result = TDEEProfile(
-                bmr=bmr,
-                tdee=tdee,
-                activity_multiplier=activity_multiplier,
-                goal_adjustment=goal_adjustment,
-                final_target=final_target
-            )
-            
+        # Extract profile data
+        age = profile.get("age")
+        weight_kg = profile.get("weight_kg")
+        height_cm = profile.get("height_cm")
+        sex = profile.get("sex_at_birth")
+        activity_level = _parse_code(ActivityLevel, profile.get("activity_level"), ActivityLevel.MODERATE)
+        goal = _parse_code(Goal, profile.get("goal"), Goal.MAINTAIN)
+        
+        if not all([age, weight_kg, height_cm, sex]):
+            raise ValueError("Missing required profile data for TDEE calculation")
+        
+        bmr, tdee, activity_multiplier, goal_adjustment, final_target = _calculate_tdee(
+            age, weight_kg, height_cm, sex, activity_level, goal
+        )
+        
+        # Ensure minimum safe calorie intake
+        if final_target > tdee + goal_adjustment:
+            logger.warning("Target calories below minimum, adjusting", 
+                         user_id=profile.get("user_id"),
+                         target=tdee + goal_adjustment,
+                         min_calories=final_target)
+        
+        result = TDEEProfile(
+            bmr=bmr,
+            tdee=tdee,
+            activity_multiplier=activity_multiplier,
+            goal_adjustment=goal_adjustment,
+            final_target=final_target
+        )
+        
+        if log_enabled:
             logger.info("TDEE calculation completed", 
                        user_id=profile.get("user_id"),
                        bmr=bmr,
                        tdee=tdee,
                        final_target=final_target)
+        
+        return result
+    
+    def calculate_tdee_batch(self, age: Sequence[float], weight_kg: Sequence[float],
+                             height_cm: Sequence[float], sex_at_birth: Sequence[str],
+                             activity_level: Sequence[str], goal: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Calculate TDEE for many users at once from parallel per-user sequences.
+        
+        Args:
+            age, weight_kg, height_cm, sex_at_birth: Required per-user inputs
+            activity_level, goal: Per-user strings or codes, defaulting like ``calculate_tdee``
             
-            return result
-            
-        except Exception as e:
-            logger.error("TDEE calculation failed", 
-                        user_id=profile.get("user_id"),
-                        error=str(e))
-            raise
+        Returns:
+            Arrays keyed like the ``TDEEProfile`` fields, one entry per user
+        """
+        age = np.asarray(age, dtype=np.float64)
+        weight_kg = np.asarray(weight_kg, dtype=np.float64)
+        height_cm = np.asarray(height_cm, dtype=np.float64)
+        
+        # Missing values arrive as NaN, which is truthy; reject them like zeros in calculate_tdee
+        required = np.stack([age, weight_kg, height_cm])
+        if np.any(np.isnan(required) | (required == 0)) or not all(sex_at_birth):
+            raise ValueError("Missing required profile data for TDEE calculation")
+        
+        is_male = np.array([sex == "male" for sex in sex_at_birth])
+        is_female = np.array([sex == "female" for sex in sex_at_birth])
+        
+        # Calculate BMR using Mifflin-St Jeor equation
+        bmr = ((10 * weight_kg) + (6.25 * height_cm) - (5 * age) + np.where(is_male, 5, -161)).astype(np.int64)
+        
+        # Apply activity multiplier
+        activity_codes = [_parse_code(ActivityLevel, level, ActivityLevel.MODERATE) for level in activity_level]
+        activity_multiplier = np.array(_ACTIVITY_MULTIPLIERS)[activity_codes]
+        tdee = (bmr * activity_multiplier).astype(np.int64)
+        
+        # Apply goal-based adjustment
+        goal_codes = [_parse_code(Goal, user_goal, Goal.MAINTAIN) for user_goal in goal]
+        goal_adjustment = np.array(_GOAL_ADJUSTMENTS, dtype=np.int64)[goal_codes]
+        
+        # Ensure minimum safe calorie intake
+        min_calories = np.where(is_female, 1200, 1500)
+        final_target = np.maximum(tdee + goal_adjustment, min_calories)
+        
+        return {
+            'bmr': bmr,
+            'tdee': tdee,
+            'activity_multiplier': activity_multiplier,
+            'goal_adjustment': goal_adjustment,
+            'final_target': final_target,
+        }
     
+    @_log_errors("Macro planning failed")
     def plan_macros(self, profile: Dict[str, Any], program_weeks: int = 12) -> List[MacroTargets]:
         """
         Plan macro targets for the entire program with periodization.
@@ -145,206 +325,154 @@ class TDEEMacroEngine:
         Returns:
             List of MacroTargets for each week
         """
-        logger.info("Planning macros", 
-                   user_id=profile.get("user_id"),
-                   program_weeks=program_weeks)
+        log_enabled = info_enabled(_stdlib_logger)
+        if log_enabled:
+            logger.info("Planning macros", 
+                       user_id=profile.get("user_id"),
+                       program_weeks=program_weeks)
         
-        try:
-            # Calculate base TDEE
-            tdee_profile = self.calculate_tdee(profile)
-            goal = profile.get("goal", "maintain")
-            experience_level = profile.get("experience_level", "beginner")
-            
-            # Get base macro ratios
-            base_ratios = self.macro_ratios.get(goal, self.macro_ratios["maintain"])
-            
-            # Calculate protein needs (g/kg bodyweight)
-            weight_kg = profile.get("weight_kg")
-            if goal in ["lose_weight", "lose_weight_aggressive"]:
-                protein_g_per_kg = 2.2  # Higher protein for weight loss
-            elif goal == "gain_muscle":
-                protein_g_per_kg = 2.0  # High protein for muscle building
-            else:
-                protein_g_per_kg = 1.8  # Moderate protein for maintenance
-            
-            base_protein_g = int(weight_kg * protein_g_per_kg)
-            
-            macro_plan = []
-            
-            for week in range(1, program_weeks + 1):
-                # Calculate weekly adjustments
-                weekly_kcal = self._calculate_weekly_kcal(
-                    tdee_profile.final_target, 
-                    week, 
-                    program_weeks, 
-                    goal,
-                    experience_level
-                )
-                
-                # Calculate macros
-                protein_g = self._calculate_protein(weekly_kcal, base_protein_g, goal)
-                fat_g = self._calculate_fat(weekly_kcal, goal)
-                carbs_g = self._calculate_carbs(weekly_kcal, protein_g, fat_g)
-                
-                # Calculate additional nutrients
-                fiber_g = self._calculate_fiber(profile, carbs_g)
-                sodium_mg = self._calculate_sodium(profile)
-                water_ml = self._calculate_water(profile, weekly_kcal)
-                
-                # Determine if refeed week
-                refeed = self._should_refeed(week, goal, experience_level)
-                
-                macro_targets = MacroTargets(
-                    kcal=weekly_kcal,
-                    protein_g=protein_g,
-                    carbs_g=carbs_g,
-                    fat_g=fat_g,
-                    fiber_g=fiber_g,
-                    sodium_mg=sodium_mg,
-                    water_ml=water_ml,
-                    refeed=refeed
-                )
-                
-                macro_plan.append(macro_targets)
-            
+        # Calculate base TDEE
+        tdee_profile = self.calculate_tdee(profile)
+        activity_level = _parse_code(ActivityLevel, profile.get("activity_level"), ActivityLevel.MODERATE)
+        goal = _parse_code(Goal, profile.get("goal"), Goal.MAINTAIN)
+        # Unrecognized experience levels are treated as advanced
+        experience_level = _parse_code(
+            ExperienceLevel, profile.get("experience_level", "beginner"), ExperienceLevel.ADVANCED
+        )
+        
+        # Get base macro ratios
+        base_ratios = _MACRO_RATIOS[goal]
+        
+        # Calculate protein needs (g/kg bodyweight)
+        weight_kg = profile.get("weight_kg")
+        base_protein_g = int(weight_kg * _PROTEIN_G_PER_KG[goal])
+        
+        protein_ratio, fat_ratio = _PROTEIN_FAT_RATIOS[goal]
+        
+        rows = _weekly_macro_rows(
+            program_weeks,
+            tdee_profile.final_target,
+            _KCAL_PERIODIZATION[goal, experience_level],
+            experience_level != ExperienceLevel.BEGINNER,  # Deload every 4th week
+            base_protein_g,
+            protein_ratio,
+            fat_ratio,
+            self._calculate_base_fiber(profile),
+            float(profile.get("weight_kg", 70) * 30),  # Base water: 30ml per kg bodyweight
+            _ACTIVITY_WATER[activity_level],
+            self._refeed_period(goal, experience_level),
+        )
+        sodium_mg = 2300 + _ACTIVITY_SODIUM[activity_level]  # US RDA plus activity
+        
+        macro_plan = self._macro_targets(rows.tolist(), sodium_mg)
+        
+        if log_enabled:
             logger.info("Macro planning completed", 
                        user_id=profile.get("user_id"),
                        weeks_planned=len(macro_plan))
+        
+        return macro_plan
+    
+    def plan_macros_batch(self, profiles: Sequence[Dict[str, Any]],
+                          program_weeks: int = 12) -> List[List[MacroTargets]]:
+        """
+        Plan macro targets for many users at once.
+        
+        Args:
+            profiles: Health profiles, each as accepted by ``plan_macros``
+            program_weeks: Number of weeks in every program
             
-            return macro_plan
-            
-        except Exception as e:
+        Returns:
+            One list of MacroTargets per profile, matching ``plan_macros``
+        """
+        if info_enabled(_stdlib_logger):
+            logger.info("Planning macros in batch", 
+                       users=len(profiles),
+                       program_weeks=program_weeks)
+        
+        # Validated by calculate_tdee_batch, which rejects missing values like plan_macros does
+        weight_kg = np.array([profile.get("weight_kg") for profile in profiles], dtype=np.float64)
+        try:
+            tdee = self.calculate_tdee_batch(
+                [profile.get("age") for profile in profiles],
+                weight_kg,
+                [profile.get("height_cm") for profile in profiles],
+                [profile.get("sex_at_birth") for profile in profiles],
+                [profile.get("activity_level") for profile in profiles],
+                [profile.get("goal") for profile in profiles],
+            )
+        except ValueError as e:
             logger.error("Macro planning failed", 
-                        user_id=profile.get("user_id"),
+                        user_ids=[profile.get("user_id") for profile in profiles],
                         error=str(e))
             raise
-    
-    def _calculate_weekly_kcal(self, base_kcal: int, week: int, total_weeks: int, 
-                              goal: str, experience_level: str) -> int:
-        """Calculate weekly calorie target with periodization."""
-        
-        # Base weekly calories
-        weekly_kcal = base_kcal
-        
-        # Apply experience-based adjustments
-        if experience_level == "beginner":
-            # Beginners get more conservative adjustments
-            adjustment_factor = 0.8
-        elif experience_level == "intermediate":
-            adjustment_factor = 1.0
-        else:  # advanced
-            adjustment_factor = 1.2
-        
-        # Apply goal-specific periodization
-        if goal in ["lose_weight", "lose_weight_aggressive"]:
-            # Progressive deficit for weight loss
-            if week <= 4:
-                weekly_kcal = int(base_kcal * (1 - 0.1 * adjustment_factor))
-            elif week <= 8:
-                weekly_kcal = int(base_kcal * (1 - 0.15 * adjustment_factor))
-            else:
-                weekly_kcal = int(base_kcal * (1 - 0.2 * adjustment_factor))
-                
-        elif goal == "gain_muscle":
-            # Progressive surplus for muscle gain
-            if week <= 4:
-                weekly_kcal = int(base_kcal * (1 + 0.05 * adjustment_factor))
-            elif week <= 8:
-                weekly_kcal = int(base_kcal * (1 + 0.1 * adjustment_factor))
-            else:
-                weekly_kcal = int(base_kcal * (1 + 0.15 * adjustment_factor))
-        
-        # Apply deload week adjustments (every 4th week)
-        if week % 4 == 0 and experience_level != "beginner":
-            weekly_kcal = int(weekly_kcal * 0.9)  # 10% reduction for deload
-        
-        return weekly_kcal
-    
-    def _calculate_protein(self, kcal: int, base_protein_g: int, goal: str) -> int:
-        """Calculate protein target in grams."""
-        # Ensure minimum protein based on bodyweight
-        min_protein = base_protein_g
-        
-        # Calculate protein from kcal ratio
-        if goal in ["lose_weight", "lose_weight_aggressive"]:
-            protein_ratio = 0.35
-        elif goal == "gain_muscle":
-            protein_ratio = 0.30
-        else:
-            protein_ratio = 0.30
+        activity_codes = np.array([
+            _parse_code(ActivityLevel, profile.get("activity_level"), ActivityLevel.MODERATE) for profile in profiles
+        ], dtype=np.int64)
+        goal_codes = np.array([
+            _parse_code(Goal, profile.get("goal"), Goal.MAINTAIN) for profile in profiles
+        ], dtype=np.int64)
+        # Unrecognized experience levels are treated as advanced
+        experience_codes = np.array([
+            _parse_code(ExperienceLevel, profile.get("experience_level", "beginner"), ExperienceLevel.ADVANCED)
+            for profile in profiles
+        ], dtype=np.int64)
         
-        protein_from_kcal = int((kcal * protein_ratio) / 4)  # 4 kcal per gram
+        protein_fat_ratios = np.array(_PROTEIN_FAT_RATIOS)[goal_codes].reshape(-1, 2)
+        is_loss_goal = np.isin(goal_codes, _LOSS_GOALS)
+        is_beginner = experience_codes == ExperienceLevel.BEGINNER
         
-        return max(min_protein, protein_from_kcal)
-    
-    def _calculate_fat(self, kcal: int, goal: str) -> int:
-        """Calculate fat target in grams."""
-        if goal in ["lose_weight", "lose_weight_aggressive"]:
-            fat_ratio = 0.30
-        elif goal == "gain_muscle":
-            fat_ratio = 0.25
-        else:
-            fat_ratio = 0.30
+        rows = _weekly_macro_rows_batch(
+            program_weeks,
+            tdee['final_target'],
+            _KCAL_PERIODIZATION[goal_codes, experience_codes],
+            ~is_beginner,  # Deload every 4th week
+            (weight_kg * np.array(_PROTEIN_G_PER_KG)[goal_codes]).astype(np.int64),
+            protein_fat_ratios[:, 0],
+            protein_fat_ratios[:, 1],
+            (weight_kg * 0.5 + 14).astype(np.int64),  # Bodyweight part of the fiber target
+            weight_kg * 30,  # Base water: 30ml per kg bodyweight
+            np.array(_ACTIVITY_WATER, dtype=np.int64)[activity_codes],
+            np.where(is_loss_goal, np.where(is_beginner, 6, 4), 0).astype(np.int64),  # Refeed period
+        )
+        sodium_mg = 2300 + np.array(_ACTIVITY_SODIUM, dtype=np.int64)[activity_codes]  # US RDA plus activity
         
-        return int((kcal * fat_ratio) / 9)  # 9 kcal per gram
+        return [
+            self._macro_targets(user_rows, user_sodium_mg)
+            for user_rows, user_sodium_mg in zip(rows.tolist(), sodium_mg.tolist())
+        ]
     
-    def _calculate_carbs(self, kcal: int, protein_g: int, fat_g: int) -> int:
-        """Calculate remaining calories as carbs."""
-        protein_kcal = protein_g * 4
-        fat_kcal = fat_g * 9
-        remaining_kcal = kcal - protein_kcal - fat_kcal
-        
-        return max(0, int(remaining_kcal / 4))  # 4 kcal per gram
-    
-    def _calculate_fiber(self, profile: Dict[str, Any], carbs_g: int) -> int:
-        """Calculate fiber target based on carbs and profile."""
-        # Base fiber: 14g per 1000 kcal
-        base_fiber = int((profile.get("weight_kg", 70) * 0.5) + 14)
-        
-        # Additional fiber based on carbs
-        fiber_from_carbs = int(carbs_g * 0.1)  # 10% of carbs as fiber
-        
-        return min(base_fiber + fiber_from_carbs, 50)  # Cap at 50g
-    
-    def _calculate_sodium(self, profile: Dict[str, Any]) -> int:
-        """Calculate sodium target based on profile."""
-        base_sodium = 2300  # mg (US RDA)
-        
-        # Adjust for activity level
-        activity_level = profile.get("activity_level", "moderate")
-        if activity_level in ["active", "very_active"]:
-            base_sodium += 500  # Additional sodium for high activity
-        
-        return base_sodium
+    def _macro_targets(self, rows: List[List[int]], sodium_mg: int) -> List[MacroTargets]:
+        """Build the weekly MacroTargets from kernel rows."""
+        macro_plan = []
+        previous_row = None
+        for row in rows:
+            # Identical consecutive weeks share one immutable MacroTargets
+            if row != previous_row:
+                targets = MacroTargets(
+                    kcal=row[_KCAL],
+                    protein_g=row[_PROTEIN],
+                    carbs_g=row[_CARBS],
+                    fat_g=row[_FAT],
+                    fiber_g=row[_FIBER],
+                    sodium_mg=sodium_mg,
+                    water_ml=row[_WATER],
+                    refeed=bool(row[_REFEED])
+                )
+                previous_row = row
+            macro_plan.append(targets)
+        return macro_plan
     
-    def _calculate_water(self, profile: Dict[str, Any], kcal: int) -> int:
-        """Calculate water target based on profile and calories."""
-        weight_kg = profile.get("weight_kg", 70)
-        activity_level = profile.get("activity_level", "moderate")
-        
-        # Base water: 30ml per kg bodyweight
-        base_water = weight_kg * 30
-        
-        # Additional water for activity
-        activity_water = {
-            'sedentary': 0,
-            'light': 500,
-            'moderate': 1000,
-            'active': 1500,
-            'very_active': 2000,
-        }.get(activity_level, 1000)
-        
-        # Additional water for calories (1ml per kcal)
-        calorie_water = int(kcal * 0.5)
-        
-        return int(base_water + activity_water + calorie_water)
+    def _calculate_base_fiber(self, profile: Dict[str, Any]) -> int:
+        """Calculate the bodyweight part of the fiber target; 10% of carbs is added weekly."""
+        return int((profile.get("weight_kg", 70) * 0.5) + 14)
     
-    def _should_refeed(self, week: int, goal: str, experience_level: str) -> bool:
-        """Determine if this should be a refeed week."""
-        if goal not in ["lose_weight", "lose_weight_aggressive"]:
-            return False
+    def _refeed_period(self, goal: Goal, experience_level: ExperienceLevel) -> int:
+        """Weeks between refeeds, or 0 when the goal has no refeeds."""
+        if goal not in _LOSS_GOALS:
+            return 0
         
-        if experience_level == "beginner":
-            return week % 6 == 0  # Every 6 weeks for beginners
+        if experience_level == ExperienceLevel.BEGINNER:
+            return 6  # Every 6 weeks for beginners
         else:
-            return week % 4 == 0  # Every 4 weeks for intermediate/advanced
+            return 4  # Every 4 weeks for intermediate/advanced
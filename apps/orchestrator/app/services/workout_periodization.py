@@ -3,14 +3,42 @@ Workout Periodization Service
 Implements progressive overload with upper/lower and push/pull/legs splits.
 """
 import structlog
-from typing import Dict, Any, List, Tuple, Optional
-from dataclasses import dataclass
+import logging
+from typing import Dict, Any, List, Sequence, Tuple, Optional
+from dataclasses import dataclass, replace
+from enum import IntEnum
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
 import math
+import numpy as np
+
+from ..core.jit import njit, prange
+from ..core.logging import info_enabled
 
 logger = structlog.get_logger()
+_stdlib_logger = logging.getLogger(__name__)
+
+class ExerciseID(IntEnum):
+    """Integer handles for the exercise database, in database order."""
+    BENCH_PRESS = 0
+    OVERHEAD_PRESS = 1
+    PULL_UPS = 2
+    ROWS = 3
+    SQUAT = 4
+    DEADLIFT = 5
+    LUNGE = 6
+    BICEP_CURL = 7
+    TRICEP_EXTENSION = 8
+    
+    @property
+    def key(self) -> str:
+        """The exercise's database id, e.g. ``"bench_press"``."""
+        return self.name.lower()
+
+_EXERCISE_HANDLES = {handle.key: handle for handle in ExerciseID}
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Exercise:
     """Represents a single exercise."""
     id: str
@@ -24,184 +52,425 @@ class Exercise:
     regressions: List[str]
     video_url: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Set:
     """Represents a single set."""
-    exercise_id: str
+    exercise_id: ExerciseID  # Serialized as ExerciseID.key
     reps: int
     weight_kg: Optional[float] = None
     rpe: Optional[int] = None  # Rate of Perceived Exertion (1-10)
     rest_seconds: int = 90
     notes: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the API, with the exercise id as its string key."""
+        return {
+            'exercise_id': self.exercise_id.key,
+            'reps': self.reps,
+            'weight_kg': self.weight_kg,
+            'rpe': self.rpe,
+            'rest_seconds': self.rest_seconds,
+            'notes': self.notes,
+        }
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Workout:
     """Represents a single workout."""
     id: str
     name: str
     day_of_week: int
     week: int
-    exercises: List[Set]
+    exercises: Sequence[Set]
     estimated_duration_min: int
     difficulty: str
     notes: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the API; sets are left as objects for the encoder's default hook."""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'day_of_week': self.day_of_week,
+            'week': self.week,
+            'exercises': self.exercises,
+            'estimated_duration_min': self.estimated_duration_min,
+            'difficulty': self.difficulty,
+            'notes': self.notes,
+        }
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TrainingSplit:
     """Represents a training split configuration."""
     name: str
     days_per_week: int
     workouts: List[Workout]
     progression_schedule: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the API; workouts are left as objects for the encoder's default hook."""
+        return {
+            'name': self.name,
+            'days_per_week': self.days_per_week,
+            'workouts': self.workouts,
+            'progression_schedule': self.progression_schedule,
+        }
+
+# Progression schemes
+_PROGRESSION_SCHEMES = MappingProxyType({
+    'linear': MappingProxyType({
+        'weight_increase': 2.5,  # kg per week
+        'rep_increase': 1,  # reps per week
+        'deload_frequency': 4,  # weeks
+    }),
+    'wave': MappingProxyType({
+        'cycles': 3,  # weeks per wave
+        'weight_increase': 5,  # kg per wave
+        'deload_frequency': 12,  # weeks
+    }),
+    'undulating': MappingProxyType({
+        'rep_ranges': (5, 8, 12),  # different rep ranges per week
+        'weight_adjustment': 0.9,  # weight reduction for higher reps
+    }),
+})
+
+# Beginners train full body, others by whether they have 6+ days available
+_SPLIT_BY_SIX_PLUS_DAYS = {True: "push_pull_legs", False: "upper_lower"}
+
+# Weeks between deloads: every 6 weeks for beginners, 4 for muscle/strength goals, 5 for general fitness
+_BEGINNER_DELOAD_FREQUENCY = 6
+_DELOAD_FREQUENCY_BY_GOAL = {"gain_muscle": 4, "strength": 4}
+_DEFAULT_DELOAD_FREQUENCY = 5
+
+# Progression scheme: linear for beginners, wave for muscle/strength goals, undulating otherwise
+_BEGINNER_SCHEME = "linear"
+_SCHEME_BY_GOAL = {"gain_muscle": "wave", "strength": "wave"}
+_DEFAULT_SCHEME = "undulating"
+
+def _deload_frequency(experience_level: str, goal: str) -> int:
+    """Weeks between deloads."""
+    if experience_level == "beginner":
+        return _BEGINNER_DELOAD_FREQUENCY
+    return _DELOAD_FREQUENCY_BY_GOAL.get(goal, _DEFAULT_DELOAD_FREQUENCY)
+
+@lru_cache(maxsize=256)
+def _should_deload(week: int, experience_level: str, goal: str) -> bool:
+    """Determine if this should be a deload week."""
+    return week % _deload_frequency(experience_level, goal) == 0
+
+@njit(parallel=True)
+def _deload_weeks(deload_frequency, program_weeks):
+    """Deload flags for weeks 1..program_weeks, one row per user."""
+    deload = np.zeros((len(deload_frequency), program_weeks), dtype=np.bool_)
+    for user in prange(len(deload_frequency)):
+        for index in range(program_weeks):
+            deload[user, index] = (index + 1) % deload_frequency[user] == 0
+    return deload
+
+@lru_cache(maxsize=256)
+def _progression_scheme(experience_level: str, goal: str) -> Tuple[str, float, int]:
+    """Pick the progression scheme, returning its name, weekly weight increase and rep increase."""
+    if experience_level == "beginner":
+        scheme = _BEGINNER_SCHEME
+    else:
+        scheme = _SCHEME_BY_GOAL.get(goal, _DEFAULT_SCHEME)
+    
+    return (
+        scheme,
+        _PROGRESSION_SCHEMES[scheme].get("weight_increase", 0),
+        _PROGRESSION_SCHEMES[scheme].get("rep_increase", 0),
+    )
+
+# Upper body sets for normal and deload weeks, shared by every upper body workout
+_UPPER_SETS = {
+    is_deload: (
+        # Compound movements
+        Set(exercise_id=ExerciseID.BENCH_PRESS, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.OVERHEAD_PRESS, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.PULL_UPS, reps=6 if not is_deload else 10, rest_seconds=120),
+        Set(exercise_id=ExerciseID.ROWS, reps=10 if not is_deload else 15, rest_seconds=90),
+        # Isolation movements
+        Set(exercise_id=ExerciseID.BICEP_CURL, reps=12 if not is_deload else 15, rest_seconds=60),
+        Set(exercise_id=ExerciseID.TRICEP_EXTENSION, reps=12 if not is_deload else 15, rest_seconds=60),
+    )
+    for is_deload in (False, True)
+}
+
+# Lower body sets for normal and deload weeks, shared by every lower body workout
+_LOWER_SETS = {
+    is_deload: (
+        # Compound movements
+        Set(exercise_id=ExerciseID.SQUAT, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.DEADLIFT, reps=6 if not is_deload else 10, rest_seconds=180),
+        Set(exercise_id=ExerciseID.LUNGE, reps=12 if not is_deload else 15, rest_seconds=90),
+    )
+    for is_deload in (False, True)
+}
+
+# Push sets for normal and deload weeks, shared by every push workout
+_PUSH_SETS = {
+    is_deload: (
+        Set(exercise_id=ExerciseID.BENCH_PRESS, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.OVERHEAD_PRESS, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.TRICEP_EXTENSION, reps=12 if not is_deload else 15, rest_seconds=60),
+    )
+    for is_deload in (False, True)
+}
+
+# Pull sets for normal and deload weeks, shared by every pull workout
+_PULL_SETS = {
+    is_deload: (
+        Set(exercise_id=ExerciseID.PULL_UPS, reps=6 if not is_deload else 10, rest_seconds=120),
+        Set(exercise_id=ExerciseID.ROWS, reps=10 if not is_deload else 15, rest_seconds=90),
+        Set(exercise_id=ExerciseID.BICEP_CURL, reps=12 if not is_deload else 15, rest_seconds=60),
+    )
+    for is_deload in (False, True)
+}
+
+# Legs sets for normal and deload weeks, shared by every legs workout
+_LEGS_SETS = {
+    is_deload: (
+        Set(exercise_id=ExerciseID.SQUAT, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.DEADLIFT, reps=6 if not is_deload else 10, rest_seconds=180),
+        Set(exercise_id=ExerciseID.LUNGE, reps=12 if not is_deload else 15, rest_seconds=90),
+    )
+    for is_deload in (False, True)
+}
+
+# Full body sets for normal and deload weeks, shared by every full body workout
+_FULL_BODY_SETS = {
+    is_deload: (
+        Set(exercise_id=ExerciseID.SQUAT, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.BENCH_PRESS, reps=8 if not is_deload else 12, rest_seconds=120),
+        Set(exercise_id=ExerciseID.ROWS, reps=10 if not is_deload else 15, rest_seconds=90),
+        Set(exercise_id=ExerciseID.OVERHEAD_PRESS, reps=8 if not is_deload else 12, rest_seconds=90),
+    )
+    for is_deload in (False, True)
+}
+
+def _incidence_matrix(labels_per_row: List[List[str]], dtype: type = bool) -> Tuple[Dict[str, int], np.ndarray]:
+    """Index the distinct labels and mark which of them each row has."""
+    index: Dict[str, int] = {}
+    for labels in labels_per_row:
+        for label in labels:
+            index.setdefault(label, len(index))
+    matrix = np.zeros((len(labels_per_row), len(index)), dtype=dtype)
+    for row, labels in enumerate(labels_per_row):
+        matrix[row, [index[label] for label in labels]] = 1
+    return index, matrix
+
+# Training splits
+_SPLITS = MappingProxyType({
+    'upper_lower': MappingProxyType({
+        'name': 'Upper/Lower Split',
+        'days_per_week': 4,
+        'workouts': ('upper_a', 'lower_a', 'upper_b', 'lower_b'),
+    }),
+    'push_pull_legs': MappingProxyType({
+        'name': 'Push/Pull/Legs Split',
+        'days_per_week': 6,
+        'workouts': ('push', 'pull', 'legs', 'push', 'pull', 'legs'),
+    }),
+    'full_body': MappingProxyType({
+        'name': 'Full Body',
+        'days_per_week': 3,
+        'workouts': ('full_body_a', 'full_body_b', 'full_body_c'),
+    }),
+})
+
+# Exercise database (simplified - in production, this would come from a database)
+_EXERCISE_DATABASE = MappingProxyType({
+    # Upper body compound
+    'bench_press': Exercise(
+        id='bench_press',
+        name='Bench Press',
+        category='compound',
+        muscle_groups=['chest', 'triceps', 'shoulders'],
+        equipment=['barbell', 'bench'],
+        difficulty='intermediate',
+        contraindications=['shoulder_injury', 'chest_injury'],
+        progressions=['incline_bench', 'decline_bench'],
+        regressions=['push_ups', 'dumbbell_press'],
+    ),
+    'overhead_press': Exercise(
+        id='overhead_press',
+        name='Overhead Press',
+        category='compound',
+        muscle_groups=['shoulders', 'triceps'],
+        equipment=['barbell'],
+        difficulty='intermediate',
+        contraindications=['shoulder_injury', 'back_injury'],
+        progressions=['push_press', 'jerk'],
+        regressions=['dumbbell_press', 'pike_push_ups'],
+    ),
+    'pull_ups': Exercise(
+        id='pull_ups',
+        name='Pull-ups',
+        category='compound',
+        muscle_groups=['back', 'biceps'],
+        equipment=['pull_up_bar'],
+        difficulty='intermediate',
+        contraindications=['shoulder_injury', 'elbow_injury'],
+        progressions=['weighted_pull_ups', 'muscle_ups'],
+        regressions=['assisted_pull_ups', 'lat_pulldown'],
+    ),
+    'rows': Exercise(
+        id='rows',
+        name='Barbell Rows',
+        category='compound',
+        muscle_groups=['back', 'biceps'],
+        equipment=['barbell'],
+        difficulty='intermediate',
+        contraindications=['back_injury'],
+        progressions=['pendlay_rows', 't_bar_rows'],
+        regressions=['dumbbell_rows', 'cable_rows'],
+    ),
+
+    # Lower body compound
+    'squat': Exercise(
+        id='squat',
+        name='Barbell Squat',
+        category='compound',
+        muscle_groups=['quads', 'glutes', 'hamstrings'],
+        equipment=['barbell'],
+        difficulty='intermediate',
+        contraindications=['knee_injury', 'back_injury'],
+        progressions=['front_squat', 'paused_squat'],
+        regressions=['goblet_squat', 'bodyweight_squat'],
+    ),
+    'deadlift': Exercise(
+        id='deadlift',
+        name='Deadlift',
+        category='compound',
+        muscle_groups=['back', 'hamstrings', 'glutes'],
+        equipment=['barbell'],
+        difficulty='advanced',
+        contraindications=['back_injury', 'hamstring_injury'],
+        progressions=['sumo_deadlift', 'romanian_deadlift'],
+        regressions=['dumbbell_deadlift', 'good_mornings'],
+    ),
+    'lunge': Exercise(
+        id='lunge',
+        name='Walking Lunges',
+        category='compound',
+        muscle_groups=['quads', 'glutes', 'hamstrings'],
+        equipment=['dumbbells'],
+        difficulty='beginner',
+        contraindications=['knee_injury'],
+        progressions=['weighted_lunges', 'reverse_lunges'],
+        regressions=['bodyweight_lunges', 'step_ups'],
+    ),
+
+    # Isolation exercises
+    'bicep_curl': Exercise(
+        id='bicep_curl',
+        name='Dumbbell Bicep Curl',
+        category='isolation',
+        muscle_groups=['biceps'],
+        equipment=['dumbbells'],
+        difficulty='beginner',
+        contraindications=['elbow_injury'],
+        progressions=['barbell_curl', 'hammer_curl'],
+        regressions=['resistance_band_curl'],
+    ),
+    'tricep_extension': Exercise(
+        id='tricep_extension',
+        name='Tricep Extension',
+        category='isolation',
+        muscle_groups=['triceps'],
+        equipment=['dumbbells'],
+        difficulty='beginner',
+        contraindications=['elbow_injury'],
+        progressions=['skull_crushers', 'diamond_push_ups'],
+        regressions=['resistance_band_extension'],
+    ),
+})
+
+# Exercise attributes as columns, one row per exercise handle, for filtering and ranking substitutions
+_EXERCISES = tuple(_EXERCISE_DATABASE[handle.key] for handle in ExerciseID)
+# Muscle groups are counted to score overlap, the other attributes only filter
+_MUSCLE_INDEX, _MUSCLE_MATRIX = _incidence_matrix(
+    [exercise.muscle_groups for exercise in _EXERCISES], dtype=np.int64
+)
+_CONTRAINDICATION_INDEX, _contraindication_matrix = _incidence_matrix(
+    [exercise.contraindications for exercise in _EXERCISES]
+)
+_EQUIPMENT_INDEX, _equipment_matrix = _incidence_matrix(
+    [exercise.equipment for exercise in _EXERCISES]
+)
+_IS_ADVANCED = np.array([exercise.difficulty == "advanced" for exercise in _EXERCISES])
+# Contraindication columns then equipment columns, so a profile's injuries and missing
+# equipment exclude exercises in one pass
+_EXCLUSION_MATRIX = np.hstack([_contraindication_matrix, _equipment_matrix])
+_category_codes = {}
+_difficulty_codes = {}
+_CATEGORY_CODES = np.array(
+    [_category_codes.setdefault(exercise.category, len(_category_codes)) for exercise in _EXERCISES]
+)
+_DIFFICULTY_CODES = np.array(
+    [_difficulty_codes.setdefault(exercise.difficulty, len(_difficulty_codes)) for exercise in _EXERCISES]
+)
+for _array in (_MUSCLE_MATRIX, _EXCLUSION_MATRIX, _IS_ADVANCED, _CATEGORY_CODES, _DIFFICULTY_CODES):
+    _array.flags.writeable = False
+
+# Users rarely change injuries or equipment, so substitution lookups repeat
+@lru_cache(maxsize=1024)
+def _suggest_substitutions(handle: ExerciseID, injuries: frozenset,
+                           available_equipment: frozenset, is_beginner: bool) -> Tuple[int, ...]:
+    """Handles of the top substitutions for an exercise; memoized on the profile fingerprint."""
+    # Shared muscle groups with the original, for every exercise
+    overlap = _MUSCLE_MATRIX @ _MUSCLE_MATRIX[handle]
+
+    # Columns for the user's injuries and for equipment they lack
+    equipment_offset = len(_CONTRAINDICATION_INDEX)
+    exclusion_columns = [
+        _CONTRAINDICATION_INDEX[injury] for injury in injuries if injury in _CONTRAINDICATION_INDEX
+    ]
+    exclusion_columns.extend(
+        equipment_offset + column
+        for equipment, column in _EQUIPMENT_INDEX.items()
+        if equipment not in available_equipment
+    )
+
+    # Similar muscle groups, no contraindication or missing equipment, and a suitable difficulty
+    candidates = (overlap > 0) & ~_EXCLUSION_MATRIX[:, exclusion_columns].any(axis=1)
+    if is_beginner:
+        candidates &= ~_IS_ADVANCED
+    candidates[handle] = False  # Skip the original exercise
+
+    # Handles follow database order, so equally relevant suggestions rank as before
+    positions = np.flatnonzero(candidates)
+
+    # Sort by relevance (same category, similar difficulty, shared muscle groups), packed into one score
+    overlap_span = _MUSCLE_MATRIX.shape[1] + 1
+    scores = (
+        (_CATEGORY_CODES[positions] == _CATEGORY_CODES[handle]) * 2 * overlap_span
+        + (_DIFFICULTY_CODES[positions] == _DIFFICULTY_CODES[handle]) * overlap_span
+        + overlap[positions]
+    )
+    ranking = np.argsort(-scores, kind="stable")[:5]  # Return top 5 suggestions
+
+    return tuple(positions[ranking].tolist())
 
 class WorkoutPeriodization:
     """Workout periodization engine with progressive overload."""
     
     def __init__(self):
-        # Training splits
-        self.splits = {
-            'upper_lower': {
-                'name': 'Upper/Lower Split',
-                'days_per_week': 4,
-                'workouts': ['upper_a', 'lower_a', 'upper_b', 'lower_b'],
-            },
-            'push_pull_legs': {
-                'name': 'Push/Pull/Legs Split',
-                'days_per_week': 6,
-                'workouts': ['push', 'pull', 'legs', 'push', 'pull', 'legs'],
-            },
-            'full_body': {
-                'name': 'Full Body',
-                'days_per_week': 3,
-                'workouts': ['full_body_a', 'full_body_b', 'full_body_c'],
-            },
-        }
+        # Training splits, exercise database and progression schemes are shared read-only tables
+        self.splits = _SPLITS
+        self.exercise_database = _EXERCISE_DATABASE
+        self.progression_schemes = _PROGRESSION_SCHEMES
         
-        # Exercise database (simplified - in production, this would come from a database)
-        self.exercise_database = {
-            # Upper body compound
-            'bench_press': Exercise(
-                id='bench_press',
-                name='Bench Press',
-                category='compound',
-                muscle_groups=['chest', 'triceps', 'shoulders'],
-                equipment=['barbell', 'bench'],
-                difficulty='intermediate',
-                contraindications=['shoulder_injury', 'chest_injury'],
-                progressions=['incline_bench', 'decline_bench'],
-                regressions=['push_ups', 'dumbbell_press'],
-            ),
-            'overhead_press': Exercise(
-                id='overhead_press',
-                name='Overhead Press',
-                category='compound',
-                muscle_groups=['shoulders', 'triceps'],
-                equipment=['barbell'],
-                difficulty='intermediate',
-                contraindications=['shoulder_injury', 'back_injury'],
-                progressions=['push_press', 'jerk'],
-                regressions=['dumbbell_press', 'pike_push_ups'],
-            ),
-            'pull_ups': Exercise(
-                id='pull_ups',
-                name='Pull-ups',
-                category='compound',
-                muscle_groups=['back', 'biceps'],
-                equipment=['pull_up_bar'],
-                difficulty='intermediate',
-                contraindications=['shoulder_injury', 'elbow_injury'],
-                progressions=['weighted_pull_ups', 'muscle_ups'],
-                regressions=['assisted_pull_ups', 'lat_pulldown'],
-            ),
-            'rows': Exercise(
-                id='rows',
-                name='Barbell Rows',
-                category='compound',
-                muscle_groups=['back', 'biceps'],
-                equipment=['barbell'],
-                difficulty='intermediate',
-                contraindications=['back_injury'],
-                progressions=['pendlay_rows', 't_bar_rows'],
-                regressions=['dumbbell_rows', 'cable_rows'],
-            ),
-            
-            # Lower body compound
-            'squat': Exercise(
-                id='squat',
-                name='Barbell Squat',
-                category='compound',
-                muscle_groups=['quads', 'glutes', 'hamstrings'],
-                equipment=['barbell'],
-                difficulty='intermediate',
-                contraindications=['knee_injury', 'back_injury'],
-                progressions=['front_squat', 'paused_squat'],
-                regressions=['goblet_squat', 'bodyweight_squat'],
-            ),
-            'deadlift': Exercise(
-                id='deadlift',
-                name='Deadlift',
-                category='compound',
-                muscle_groups=['back', 'hamstrings', 'glutes'],
-                equipment=['barbell'],
-                difficulty='advanced',
-                contraindications=['back_injury', 'hamstring_injury'],
-                progressions=['sumo_deadlift', 'romanian_deadlift'],
-                regressions=['dumbbell_deadlift', 'good_mornings'],
-            ),
-            'lunge': Exercise(
-                id='lunge',
-                name='Walking Lunges',
-                category='compound',
-                muscle_groups=['quads', 'glutes', 'hamstrings'],
-                equipment=['dumbbells'],
-                difficulty='beginner',
-                contraindications=['knee_injury'],
-                progressions=['weighted_lunges', 'reverse_lunges'],
-                regressions=['bodyweight_lunges', 'step_ups'],
-            ),
-            
-            # Isolation exercises
-            'bicep_curl': Exercise(
-                id='bicep_curl',
-                name='Dumbbell Bicep Curl',
-                category='isolation',
-                muscle_groups=['biceps'],
-                equipment=['dumbbells'],
-                difficulty='beginner',
-                contraindications=['elbow_injury'],
-                progressions=['barbell_curl', 'hammer_curl'],
-                regressions=['resistance_band_curl'],
-            ),
-            'tricep_extension': Exercise(
-                id='tricep_extension',
-                name='Tricep Extension',
-                category='isolation',
-                muscle_groups=['triceps'],
-                equipment=['dumbbells'],
-                difficulty='beginner',
-                contraindications=['elbow_injury'],
-                progressions=['skull_crushers', 'diamond_push_ups'],
-                regressions=['resistance_band_extension'],
-            ),
-        }
-        
-        # Progression schemes
-        self.progression_schemes = {
-            'linear': {
-                'weight_increase': 2.5,  # kg per week
-                'rep_increase': 1,  # reps per week
-                'deload_frequency': 4,  # weeks
-            },
-            'wave': {
-                'cycles': 3,  # weeks per wave
-                'weight_increase': 5,  # kg per wave
-                'deload_frequency': 12,  # weeks
-            },
-            'undulating': {
-                'rep_ranges': [5, 8, 12],  # different rep ranges per week
-                'weight_adjustment': 0.9,  # weight reduction for higher reps
-            },
+        # Workouts only differ by week, so each split's workouts are built once per deload state;
+        # template ids and names end in the week number, 0, leaving the prefix to append weeks to
+        self._workout_templates = {
+            (split_type, is_deload): [
+                (template, template.id[:-1], template.name[:-1])
+                for template in self._build_weekly_workouts(split_type, 0, {}, is_deload)
+            ]
+            for split_type in self.splits
+            for is_deload in (False, True)
         }
+        self._split_name_suffixes = {split_type: " - " + split['name'] for split_type, split in self.splits.items()}
     
     def generate_program(self, profile: Dict[str, Any], program_weeks: int = 12) -> List[TrainingSplit]:
         """
@@ -214,9 +483,11 @@ class WorkoutPeriodization:
         Returns:
             List of TrainingSplit for each week
         """
-        logger.info("Generating training program", 
-                   user_id=profile.get("user_id"),
-                   program_weeks=program_weeks)
+        log_enabled = info_enabled(_stdlib_logger)
+        if log_enabled:
+            logger.info("Generating training program", 
+                       user_id=profile.get("user_id"),
+                       program_weeks=program_weeks)
         
         try:
             # Determine training split based on profile
@@ -229,29 +500,16 @@ class WorkoutPeriodization:
             
             for week in range(1, program_weeks + 1):
                 # Determine if this is a deload week
-                is_deload = self._should_deload(week, experience_level, goal)
+                is_deload = _should_deload(week, experience_level, goal)
                 
-                # Generate workouts for this week
-                workouts = self._generate_weekly_workouts(
-                    split_type=split_type,
-                    week=week,
-                    profile=profile,
-                    is_deload=is_deload
+                weekly_splits.append(
+                    self._training_split(split_type, week, profile, experience_level, goal, is_deload)
                 )
-                
-                # Create training split
-                training_split = TrainingSplit(
-                    name=f"Week {week} - {self.splits[split_type]['name']}",
-                    days_per_week=self.splits[split_type]['days_per_week'],
-                    workouts=workouts,
-                    progression_schedule=self._get_progression_schedule(week, experience_level, goal)
-                )
-                
-                weekly_splits.append(training_split)
             
-            logger.info("Training program generated", 
-                       user_id=profile.get("user_id"),
-                       weeks_generated=len(weekly_splits))
+            if log_enabled:
+                logger.info("Training program generated", 
+                           user_id=profile.get("user_id"),
+                           weeks_generated=len(weekly_splits))
             
             return weekly_splits
             
@@ -261,31 +519,83 @@ class WorkoutPeriodization:
                         error=str(e))
             raise
     
+    def generate_programs_batch(self, profiles: List[Dict[str, Any]],
+                                program_weeks: int = 12) -> List[List[TrainingSplit]]:
+        """
+        Generate training programs for many users at once.
+        
+        Args:
+            profiles: User health profiles, each as accepted by ``generate_program``
+            program_weeks: Number of weeks in every program
+            
+        Returns:
+            One list of TrainingSplit per profile, matching ``generate_program``
+        """
+        if info_enabled(_stdlib_logger):
+            logger.info("Generating training programs in batch", 
+                       users=len(profiles),
+                       program_weeks=program_weeks)
+        
+        profile_settings = [
+            (profile, profile.get("experience_level", "beginner"), profile.get("goal", "improve_fitness"))
+            for profile in profiles
+        ]
+        
+        # Deload weeks for every user from one compiled kernel call
+        deload_weeks = _deload_weeks(
+            np.array([_deload_frequency(experience_level, goal) for _, experience_level, goal in profile_settings],
+                     dtype=np.int64),
+            max(program_weeks, 0),
+        )
+        
+        programs = []
+        for (profile, experience_level, goal), user_deload_weeks in zip(profile_settings, deload_weeks.tolist()):
+            split_type = self._determine_split_type(profile)
+            programs.append([
+                self._training_split(split_type, week, profile, experience_level, goal, is_deload)
+                for week, is_deload in enumerate(user_deload_weeks, start=1)
+            ])
+        
+        return programs
+    
+    def _training_split(self, split_type: str, week: int, profile: Dict[str, Any],
+                        experience_level: str, goal: str, is_deload: bool) -> TrainingSplit:
+        """Create the training split for one program week."""
+        # Generate workouts for this week
+        workouts = self._generate_weekly_workouts(
+            split_type=split_type,
+            week=week,
+            profile=profile,
+            is_deload=is_deload
+        )
+        
+        return TrainingSplit(
+            name="Week " + str(week) + self._split_name_suffixes[split_type],
+            days_per_week=self.splits[split_type]['days_per_week'],
+            workouts=workouts,
+            progression_schedule=self._get_progression_schedule(week, experience_level, goal, is_deload)
+        )
+    
     def _determine_split_type(self, profile: Dict[str, Any]) -> str:
         """Determine the best training split based on profile."""
         experience_level = profile.get("experience_level", "beginner")
-        days_available = profile.get("training_days_per_week", 3)
-        goal = profile.get("goal", "improve_fitness")
         
         if experience_level == "beginner":
             return "full_body"
-        elif days_available >= 6:
-            return "push_pull_legs"
-        else:
-            return "upper_lower"
-    
-    def _should_deload(self, week: int, experience_level: str, goal: str) -> bool:
-        """Determine if this should be a deload week."""
-        if experience_level == "beginner":
-            return week % 6 == 0  # Every 6 weeks for beginners
-        elif goal in ["gain_muscle", "strength"]:
-            return week % 4 == 0  # Every 4 weeks for muscle/strength goals
-        else:
-            return week % 5 == 0  # Every 5 weeks for general fitness
+        return _SPLIT_BY_SIX_PLUS_DAYS[profile.get("training_days_per_week", 3) >= 6]
     
     def _generate_weekly_workouts(self, split_type: str, week: int, 
                                 profile: Dict[str, Any], is_deload: bool) -> List[Workout]:
-        """Generate workouts for a specific week."""
+        """Generate workouts for a specific week from the split's week-0 templates."""
+        week_label = str(week)
+        return [
+            replace(template, id=id_prefix + week_label, name=name_prefix + week_label, week=week)
+            for template, id_prefix, name_prefix in self._workout_templates[(split_type, is_deload)]
+        ]
+    
+    def _build_weekly_workouts(self, split_type: str, week: int, 
+                               profile: Dict[str, Any], is_deload: bool) -> List[Workout]:
+        """Build workouts for a specific week."""
         workouts = []
         
         if split_type == "upper_lower":
@@ -316,28 +626,12 @@ class WorkoutPeriodization:
     def _generate_upper_workout(self, week: int, profile: Dict[str, Any], 
                               is_deload: bool, variant: str = "A") -> Workout:
         """Generate an upper body workout."""
-        exercises = []
-        
-        # Compound movements
-        exercises.extend([
-            Set(exercise_id='bench_press', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='overhead_press', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='pull_ups', reps=6 if not is_deload else 10, rest_seconds=120),
-            Set(exercise_id='rows', reps=10 if not is_deload else 15, rest_seconds=90),
-        ])
-        
-        # Isolation movements
-        exercises.extend([
-            Set(exercise_id='bicep_curl', reps=12 if not is_deload else 15, rest_seconds=60),
-            Set(exercise_id='tricep_extension', reps=12 if not is_deload else 15, rest_seconds=60),
-        ])
-        
         return Workout(
             id=f"upper_{variant}_week_{week}",
             name=f"Upper Body {variant} - Week {week}",
             day_of_week=1 if variant == "A" else 3,
             week=week,
-            exercises=exercises,
+            exercises=_UPPER_SETS[is_deload],
             estimated_duration_min=60 if not is_deload else 45,
             difficulty="intermediate" if not is_deload else "beginner",
             notes="Focus on form and controlled movements" if is_deload else None
@@ -346,21 +640,12 @@ class WorkoutPeriodization:
     def _generate_lower_workout(self, week: int, profile: Dict[str, Any], 
                               is_deload: bool, variant: str = "A") -> Workout:
         """Generate a lower body workout."""
-        exercises = []
-        
-        # Compound movements
-        exercises.extend([
-            Set(exercise_id='squat', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='deadlift', reps=6 if not is_deload else 10, rest_seconds=180),
-            Set(exercise_id='lunge', reps=12 if not is_deload else 15, rest_seconds=90),
-        ])
-        
         return Workout(
             id=f"lower_{variant}_week_{week}",
             name=f"Lower Body {variant} - Week {week}",
             day_of_week=2 if variant == "A" else 4,
             week=week,
-            exercises=exercises,
+            exercises=_LOWER_SETS[is_deload],
             estimated_duration_min=75 if not is_deload else 60,
             difficulty="intermediate" if not is_deload else "beginner",
             notes="Focus on form and controlled movements" if is_deload else None
@@ -369,20 +654,12 @@ class WorkoutPeriodization:
     def _generate_push_workout(self, week: int, profile: Dict[str, Any], 
                              is_deload: bool, variant: str = "A") -> Workout:
         """Generate a push workout (chest, shoulders, triceps)."""
-        exercises = []
-        
-        exercises.extend([
-            Set(exercise_id='bench_press', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='overhead_press', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='tricep_extension', reps=12 if not is_deload else 15, rest_seconds=60),
-        ])
-        
         return Workout(
             id=f"push_{variant}_week_{week}",
             name=f"Push {variant} - Week {week}",
             day_of_week=1 if variant == "A" else 4,
             week=week,
-            exercises=exercises,
+            exercises=_PUSH_SETS[is_deload],
             estimated_duration_min=45 if not is_deload else 35,
             difficulty="intermediate" if not is_deload else "beginner",
         )
@@ -390,20 +667,12 @@ class WorkoutPeriodization:
     def _generate_pull_workout(self, week: int, profile: Dict[str, Any], 
                              is_deload: bool, variant: str = "A") -> Workout:
         """Generate a pull workout (back, biceps)."""
-        exercises = []
-        
-        exercises.extend([
-            Set(exercise_id='pull_ups', reps=6 if not is_deload else 10, rest_seconds=120),
-            Set(exercise_id='rows', reps=10 if not is_deload else 15, rest_seconds=90),
-            Set(exercise_id='bicep_curl', reps=12 if not is_deload else 15, rest_seconds=60),
-        ])
-        
         return Workout(
             id=f"pull_{variant}_week_{week}",
             name=f"Pull {variant} - Week {week}",
             day_of_week=2 if variant == "A" else 5,
             week=week,
-            exercises=exercises,
+            exercises=_PULL_SETS[is_deload],
             estimated_duration_min=45 if not is_deload else 35,
             difficulty="intermediate" if not is_deload else "beginner",
         )
@@ -411,20 +680,12 @@ class WorkoutPeriodization:
     def _generate_legs_workout(self, week: int, profile: Dict[str, Any], 
                              is_deload: bool, variant: str = "A") -> Workout:
         """Generate a legs workout."""
-        exercises = []
-        
-        exercises.extend([
-            Set(exercise_id='squat', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='deadlift', reps=6 if not is_deload else 10, rest_seconds=180),
-            Set(exercise_id='lunge', reps=12 if not is_deload else 15, rest_seconds=90),
-        ])
-        
         return Workout(
             id=f"legs_{variant}_week_{week}",
             name=f"Legs {variant} - Week {week}",
             day_of_week=3 if variant == "A" else 6,
             week=week,
-            exercises=exercises,
+            exercises=_LEGS_SETS[is_deload],
             estimated_duration_min=60 if not is_deload else 45,
             difficulty="intermediate" if not is_deload else "beginner",
         )
@@ -432,84 +693,56 @@ class WorkoutPeriodization:
     def _generate_full_body_workout(self, week: int, profile: Dict[str, Any], 
                                   is_deload: bool, variant: str = "A") -> Workout:
         """Generate a full body workout."""
-        exercises = []
-        
-        exercises.extend([
-            Set(exercise_id='squat', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='bench_press', reps=8 if not is_deload else 12, rest_seconds=120),
-            Set(exercise_id='rows', reps=10 if not is_deload else 15, rest_seconds=90),
-            Set(exercise_id='overhead_press', reps=8 if not is_deload else 12, rest_seconds=90),
-        ])
-        
         return Workout(
             id=f"full_body_{variant}_week_{week}",
             name=f"Full Body {variant} - Week {week}",
             day_of_week=1 if variant == "A" else (2 if variant == "B" else 3),
             week=week,
-            exercises=exercises,
+            exercises=_FULL_BODY_SETS[is_deload],
             estimated_duration_min=60 if not is_deload else 45,
             difficulty="beginner" if not is_deload else "beginner",
         )
     
-    def _get_progression_schedule(self, week: int, experience_level: str, goal: str) -> Dict[str, Any]:
+    def _get_progression_schedule(self, week: int, experience_level: str, goal: str,
+                                  is_deload: bool) -> Dict[str, Any]:
         """Get progression schedule for the week."""
-        if experience_level == "beginner":
-            scheme = "linear"
-        elif goal in ["gain_muscle", "strength"]:
-            scheme = "wave"
-        else:
-            scheme = "undulating"
+        scheme, weight_increase, rep_increase = _progression_scheme(experience_level, goal)
         
         return {
             "scheme": scheme,
             "week": week,
-            "weight_increase": self.progression_schemes[scheme].get("weight_increase", 0),
-            "rep_increase": self.progression_schemes[scheme].get("rep_increase", 0),
-            "is_deload": self._should_deload(week, experience_level, goal),
+            "weight_increase": weight_increase,
+            "rep_increase": rep_increase,
+            "is_deload": is_deload,
         }
     
     def suggest_substitutions(self, exercise_id: str, profile: Dict[str, Any], 
                             reason: str = "injury") -> List[Exercise]:
         """Suggest exercise substitutions based on contraindications."""
-        original_exercise = self.exercise_database.get(exercise_id)
-        if not original_exercise:
+        handle = exercise_id if isinstance(exercise_id, ExerciseID) else _EXERCISE_HANDLES.get(exercise_id)
+        if handle is None:
             return []
         
-        suggestions = []
-        
-        # Check contraindications
-        contraindications = profile.get("injuries", [])
-        available_equipment = profile.get("equipment_access", [])
-        experience_level = profile.get("experience_level", "beginner")
-        
-        for exercise in self.exercise_database.values():
-            # Skip the original exercise
-            if exercise.id == exercise_id:
-                continue
-            
-            # Check if exercise targets similar muscle groups
-            if not any(mg in exercise.muscle_groups for mg in original_exercise.muscle_groups):
-                continue
-            
-            # Check contraindications
-            if any(contraindication in exercise.contraindications for contraindication in contraindications):
-                continue
-            
-            # Check equipment availability
-            if not all(eq in available_equipment for eq in exercise.equipment):
-                continue
-            
-            # Check difficulty level
-            if experience_level == "beginner" and exercise.difficulty == "advanced":
-                continue
-            
-            suggestions.append(exercise)
-        
-        # Sort by relevance (same category, similar difficulty)
-        suggestions.sort(key=lambda x: (
-            x.category == original_exercise.category,
-            x.difficulty == original_exercise.difficulty,
-            len(set(x.muscle_groups) & set(original_exercise.muscle_groups))
-        ), reverse=True)
-        
-        return suggestions[:5]  # Return top 5 suggestions
+        # Only the sets of injuries and equipment matter, so equivalent profiles share a cache entry
+        suggestions = _suggest_substitutions(
+            handle,
+            frozenset(profile.get("injuries", [])),
+            frozenset(profile.get("equipment_access", [])),
+            profile.get("experience_level", "beginner") == "beginner",
+        )
+        return [_EXERCISES[position] for position in suggestions]
+
+# Periodization engine owned by a program worker process, created by its initializer
+_worker_periodization: Optional[WorkoutPeriodization] = None
+
+def setup_worker() -> None:
+    """Build the periodization engine once per worker process."""
+    global _worker_periodization
+    _worker_periodization = WorkoutPeriodization()
+
+def generate_programs_in_worker(profiles: List[Dict[str, Any]],
+                                program_weeks: int = 12) -> List[List[TrainingSplit]]:
+    """Generate a chunk of users' programs in a worker process."""
+    if _worker_periodization is None:
+        setup_worker()
+    return _worker_periodization.generate_programs_batch(profiles, program_weeks)
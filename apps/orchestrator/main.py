@@ -1,22 +1,32 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import uvicorn
 from contextlib import asynccontextmanager
 import structlog
+import json
 
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.logging import setup_logging
+from app.core.responses import ServiceJSONResponse
 
 logger = structlog.get_logger()
 
+# The health payload never changes, so its JSON body is rendered once
+_HEALTH_BODY = json.dumps({"status": "healthy", "service": "orchestrator"}, separators=(",", ":")).encode()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Health & Wellness Advisor Crew Orchestrator")
+    # Worker pool for batch program generation, started by the first batch request
+    app.state.program_pool = None
     yield
     # Shutdown
+    if app.state.program_pool is not None:
+        app.state.program_pool.shutdown()
     logger.info("Shutting down Health & Wellness Advisor Crew Orchestrator")
 
 def create_application() -> FastAPI:
@@ -29,20 +39,22 @@ def create_application() -> FastAPI:
         docs_url="/api/docs" if settings.ENVIRONMENT != "production" else None,
         redoc_url="/api/redoc" if settings.ENVIRONMENT != "production" else None,
         lifespan=lifespan,
+        default_response_class=ServiceJSONResponse,
     )
 
-    # Security middleware
-    app.add_middleware(
-        TrustedHostMiddleware,
-        allowed_hosts=settings.ALLOWED_HOSTS,
-    )
+    # Security middleware; a wildcard host list would accept every request anyway
+    if settings.ALLOWED_HOSTS != ["*"]:
+        app.add_middleware(
+            TrustedHostMiddleware,
+            allowed_hosts=settings.ALLOWED_HOSTS,
+        )
 
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.ALLOWED_ORIGINS,
         allow_credentials=True,
-        allow_methods=["*"],
+        allow_methods=["GET", "POST"],  # The only methods the API routes use
         allow_headers=["*"],
     )
 
@@ -51,7 +63,8 @@ def create_application() -> FastAPI:
 
     @app.get("/health")
     async def health_check():
-        return {"status": "healthy", "service": "orchestrator"}
+        # A fresh response per request, since middleware appends to its headers
+        return Response(content=_HEALTH_BODY, media_type="application/json")
 
     return app
 
@@ -62,6 +75,8 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=settings.ENVIRONMENT == "development",
         log_level="info",
     )
@@ -1,11 +1,12 @@
 """
 Contract tests for OpenAPI and Zod schema parity.
+The tests share no mutable state, so they can run across cores with ``pytest -n auto``.
 """
 import pytest
 import json
-from typing import Dict, Any, List
-from pydantic import ValidationError
-from fastapi.openapi.utils import get_openapi
+from enum import Enum
+from typing import Dict, Any, List, FrozenSet, Literal, Tuple, Union, get_args, get_origin
+from pydantic import TypeAdapter, ValidationError
 from apps.orchestrator.app.main import app
 from apps.orchestrator.app.schemas import (
     UserProfile,
@@ -18,260 +19,261 @@ from apps.orchestrator.app.schemas import (
     Adjustment
 )
 
-class TestOpenAPIZodParity:
-    """Test that OpenAPI schemas match Zod validation schemas."""
-    
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.openapi_schema = get_openapi(
-            title=app.title,
-            version=app.version,
-            openapi_version=app.openapi_version,
-            description=app.description,
-            routes=app.routes,
-        )
-    
-    def test_user_profile_schema_parity(self):
-        """Test UserProfile schema parity."""
-        # Get OpenAPI schema
-        openapi_schema = self.openapi_schema["components"]["schemas"]["UserProfile"]
-        
-        # Test valid data
-        valid_data = {
-            "id": "user123",
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
-            "age": 30,
-            "weight_kg": 75.0,
-            "height_cm": 175,
-            "is_male": True,
-            "activity_level": "moderately_active",
-            "goal": "weight_loss",
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-        
-        # Should validate successfully
-        user_profile = UserProfile(**valid_data)
-        assert user_profile.id == valid_data["id"]
-        assert user_profile.email == valid_data["email"]
-        
-        # Test invalid data
-        invalid_data = valid_data.copy()
-        invalid_data["email"] = "invalid-email"
-        
-        with pytest.raises(ValidationError):
-            UserProfile(**invalid_data)
-    
-    def test_health_profile_schema_parity(self):
-        """Test HealthProfile schema parity."""
-        valid_data = {
-            "user_id": "user123",
-            "parq_completed": True,
-            "parq_risk_level": "low",
-            "medical_conditions": ["hypertension"],
-            "medications": ["lisinopril"],
-            "allergies": ["peanuts"],
-            "injuries": ["lower_back_pain"],
-            "fitness_level": "intermediate",
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-        
-        # Should validate successfully
-        health_profile = HealthProfile(**valid_data)
-        assert health_profile.user_id == valid_data["user_id"]
-        assert health_profile.parq_completed == valid_data["parq_completed"]
-        
-        # Test invalid risk level
-        invalid_data = valid_data.copy()
-        invalid_data["parq_risk_level"] = "invalid_level"
-        
-        with pytest.raises(ValidationError):
-            HealthProfile(**invalid_data)
-    
-    def test_program_schema_parity(self):
-        """Test Program schema parity."""
-        valid_data = {
-            "id": "program123",
-            "user_id": "user123",
-            "name": "12-Week Weight Loss",
-            "goal": "weight_loss",
-            "duration_weeks": 12,
-            "status": "active",
-            "current_week": 4,
-            "start_date": "2024-01-01T00:00:00Z",
-            "end_date": "2024-03-25T00:00:00Z",
-            "created_at": "2024-01-01T00:00:00Z",
-            "updated_at": "2024-01-01T00:00:00Z"
-        }
-        
-        # Should validate successfully
-        program = Program(**valid_data)
-        assert program.id == valid_data["id"]
-        assert program.status == valid_data["status"]
-        
-        # Test invalid status
-        invalid_data = valid_data.copy()
-        invalid_data["status"] = "invalid_status"
-        
-        with pytest.raises(ValidationError):
-            Program(**invalid_data)
-    
-    def test_macro_targets_schema_parity(self):
-        """Test MacroTargets schema parity."""
-        valid_data = {
-            "calories": 2000,
-            "protein_g": 150,
-            "carbs_g": 200,
-            "fats_g": 67,
-            "fiber_g": 28,
-            "sodium_mg": 2300
+@pytest.fixture(scope="session")
+def openapi_components() -> Dict[str, Any]:
+    """Component schemas of the app's OpenAPI document, built only when a test requests them."""
+    # app.openapi() memoizes the document on the app, so it is shared with anything else that asks
+    return app.openapi()["components"]["schemas"]
+
+# Validators built once per model for the rejection checks
+_ADAPTERS = {
+    cls: TypeAdapter(cls)
+    for cls in (UserProfile, HealthProfile, Program, MacroTargets, Workout, MealPlan, CheckIn, Adjustment)
+}
+
+# Valid payloads shared by the parity tests; never mutated, invalid variants rebuild only the changed fields
+_USER_PROFILE_VALID = {
+    "id": "user123",
+    "email": "test@example.com",
+    "first_name": "John",
+    "last_name": "Doe",
+    "age": 30,
+    "weight_kg": 75.0,
+    "height_cm": 175,
+    "is_male": True,
+    "activity_level": "moderately_active",
+    "goal": "weight_loss",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z"
+}
+
+_HEALTH_PROFILE_VALID = {
+    "user_id": "user123",
+    "parq_completed": True,
+    "parq_risk_level": "low",
+    "medical_conditions": ["hypertension"],
+    "medications": ["lisinopril"],
+    "allergies": ["peanuts"],
+    "injuries": ["lower_back_pain"],
+    "fitness_level": "intermediate",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z"
+}
+
+_PROGRAM_VALID = {
+    "id": "program123",
+    "user_id": "user123",
+    "name": "12-Week Weight Loss",
+    "goal": "weight_loss",
+    "duration_weeks": 12,
+    "status": "active",
+    "current_week": 4,
+    "start_date": "2024-01-01T00:00:00Z",
+    "end_date": "2024-03-25T00:00:00Z",
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z"
+}
+
+_MACRO_TARGETS_VALID = {
+    "calories": 2000,
+    "protein_g": 150,
+    "carbs_g": 200,
+    "fats_g": 67,
+    "fiber_g": 28,
+    "sodium_mg": 2300
+}
+
+_WORKOUT_VALID = {
+    "id": "workout123",
+    "program_id": "program123",
+    "week_number": 4,
+    "day_number": 1,
+    "name": "Upper Body Strength",
+    "type": "strength",
+    "duration_minutes": 60,
+    "exercises": [
+        {
+            "exercise_id": "bench_press",
+            "name": "Bench Press",
+            "sets": 3,
+            "reps": 8,
+            "weight_kg": 80,
+            "rest_seconds": 120
         }
-        
-        # Should validate successfully
-        macro_targets = MacroTargets(**valid_data)
-        assert macro_targets.calories == valid_data["calories"]
-        assert macro_targets.protein_g == valid_data["protein_g"]
-        
-        # Test negative values
-        invalid_data = valid_data.copy()
-        invalid_data["calories"] = -100
-        
-        with pytest.raises(ValidationError):
-            MacroTargets(**invalid_data)
-    
-    def test_workout_schema_parity(self):
-        """Test Workout schema parity."""
-        valid_data = {
-            "id": "workout123",
-            "program_id": "program123",
-            "week_number": 4,
-            "day_number": 1,
-            "name": "Upper Body Strength",
-            "type": "strength",
-            "duration_minutes": 60,
-            "exercises": [
+    ],
+    "created_at": "2024-01-01T00:00:00Z"
+}
+
+_MEAL_PLAN_VALID = {
+    "id": "meal_plan123",
+    "program_id": "program123",
+    "week_number": 4,
+    "day_number": 1,
+    "meals": [
+        {
+            "meal_id": "meal1",
+            "name": "Breakfast",
+            "type": "breakfast",
+            "calories": 500,
+            "protein_g": 30,
+            "carbs_g": 50,
+            "fats_g": 20,
+            "recipes": [
                 {
-                    "exercise_id": "bench_press",
-                    "name": "Bench Press",
-                    "sets": 3,
-                    "reps": 8,
-                    "weight_kg": 80,
-                    "rest_seconds": 120
+                    "recipe_id": "oatmeal",
+                    "name": "Protein Oatmeal",
+                    "servings": 1
                 }
-            ],
-            "created_at": "2024-01-01T00:00:00Z"
+            ]
         }
-        
-        # Should validate successfully
-        workout = Workout(**valid_data)
-        assert workout.id == valid_data["id"]
-        assert len(workout.exercises) == 1
-        
-        # Test invalid exercise data
-        invalid_data = valid_data.copy()
-        invalid_data["exercises"][0]["sets"] = -1
-        
-        with pytest.raises(ValidationError):
-            Workout(**invalid_data)
+    ],
+    "total_calories": 2000,
+    "created_at": "2024-01-01T00:00:00Z"
+}
+
+_CHECK_IN_VALID = {
+    "id": "checkin123",
+    "user_id": "user123",
+    "program_id": "program123",
+    "week_number": 4,
+    "weight_kg": 74.5,
+    "body_fat_percentage": 18.5,
+    "sleep_quality": 7,
+    "stress_level": 5,
+    "energy_level": 8,
+    "mood": 7,
+    "notes": "Feeling good this week",
+    "created_at": "2024-01-01T00:00:00Z"
+}
+
+_ADJUSTMENT_VALID = {
+    "id": "adjustment123",
+    "program_id": "program123",
+    "check_in_id": "checkin123",
+    "type": "calorie_adjustment",
+    "value": -150,
+    "reason": "Weight loss plateau detected",
+    "confidence": 0.85,
+    "applied": True,
+    "created_at": "2024-01-01T00:00:00Z"
+}
+
+# Minimal user profile request shared by the endpoint, validation and compatibility tests
+_USER_PROFILE_REQUEST = {
+    "email": "test@example.com",
+    "first_name": "John",
+    "last_name": "Doe",
+    "age": 30,
+    "weight_kg": 75.0,
+    "height_cm": 175,
+    "is_male": True,
+    "activity_level": "moderately_active",
+    "goal": "weight_loss"
+}
+
+_VALID_PAYLOADS = {
+    UserProfile: _USER_PROFILE_VALID,
+    HealthProfile: _HEALTH_PROFILE_VALID,
+    Program: _PROGRAM_VALID,
+    MacroTargets: _MACRO_TARGETS_VALID,
+    Workout: _WORKOUT_VALID,
+    MealPlan: _MEAL_PLAN_VALID,
+    CheckIn: _CHECK_IN_VALID,
+    Adjustment: _ADJUSTMENT_VALID,
+}
+
+def _choice_sets() -> Dict[Tuple[type, str], FrozenSet[Any]]:
+    """Allowed values of every top-level Enum or Literal field, read from the pydantic models."""
+    choices = {}
+    for cls in _VALID_PAYLOADS:
+        for name, field in cls.model_fields.items():
+            annotation = field.annotation
+            # Optional[X] is Union[X, None]; look through it to the choice type
+            candidates = get_args(annotation) if get_origin(annotation) is Union else (annotation,)
+            for candidate in candidates:
+                if isinstance(candidate, type) and issubclass(candidate, Enum):
+                    choices[(cls, name)] = frozenset(member.value for member in candidate)
+                elif get_origin(candidate) is Literal:
+                    choices[(cls, name)] = frozenset(get_args(candidate))
+    return choices
+
+# Lookup tables built once at import; fuzz candidates are screened by set membership
+_CHOICES = _choice_sets()
+
+_INVALID_CHOICE_VALUES = (
+    "", " ", "invalid", "INVALID", "none", "null", "unknown", "active ", " low",
+    "Active", "LOW", "weight-loss", "weight loss", "moderately-active", "0", "-1",
+)
+
+class TestOpenAPIZodParity:
+    """Test that OpenAPI schemas match Zod validation schemas."""
     
-    def test_meal_plan_schema_parity(self):
-        """Test MealPlan schema parity."""
-        valid_data = {
-            "id": "meal_plan123",
-            "program_id": "program123",
-            "week_number": 4,
-            "day_number": 1,
-            "meals": [
-                {
-                    "meal_id": "meal1",
-                    "name": "Breakfast",
-                    "type": "breakfast",
-                    "calories": 500,
-                    "protein_g": 30,
-                    "carbs_g": 50,
-                    "fats_g": 20,
-                    "recipes": [
-                        {
-                            "recipe_id": "oatmeal",
-                            "name": "Protein Oatmeal",
-                            "servings": 1
-                        }
-                    ]
-                }
-            ],
-            "total_calories": 2000,
-            "created_at": "2024-01-01T00:00:00Z"
-        }
-        
-        # Should validate successfully
-        meal_plan = MealPlan(**valid_data)
-        assert meal_plan.id == valid_data["id"]
-        assert len(meal_plan.meals) == 1
-        
-        # Test invalid meal type
-        invalid_data = valid_data.copy()
-        invalid_data["meals"][0]["type"] = "invalid_type"
-        
-        with pytest.raises(ValidationError):
-            MealPlan(**invalid_data)
+    @pytest.mark.parametrize("model_cls, valid_data", list(_VALID_PAYLOADS.items()))
+    def test_valid_data_validates(self, model_cls, valid_data):
+        """Test that each model's valid data passes full validation."""
+        model_cls.model_validate(valid_data)
     
-    def test_check_in_schema_parity(self):
-        """Test CheckIn schema parity."""
-        valid_data = {
-            "id": "checkin123",
-            "user_id": "user123",
-            "program_id": "program123",
-            "week_number": 4,
-            "weight_kg": 74.5,
-            "body_fat_percentage": 18.5,
-            "sleep_quality": 7,
-            "stress_level": 5,
-            "energy_level": 8,
-            "mood": 7,
-            "notes": "Feeling good this week",
-            "created_at": "2024-01-01T00:00:00Z"
-        }
-        
-        # Should validate successfully
-        check_in = CheckIn(**valid_data)
-        assert check_in.id == valid_data["id"]
-        assert check_in.weight_kg == valid_data["weight_kg"]
-        
-        # Test invalid scale values
-        invalid_data = valid_data.copy()
-        invalid_data["sleep_quality"] = 15  # Should be 1-10
-        
-        with pytest.raises(ValidationError):
-            CheckIn(**invalid_data)
+    @pytest.mark.parametrize(
+        "model_cls, field",
+        list(_CHOICES),
+        ids=[f"{cls.__name__}-{field}" for cls, field in _CHOICES]
+    )
+    def test_choice_field_rejects_unknown_values(self, model_cls, field):
+        """Test that Enum/Literal fields accept their valid value and reject values outside the choice set."""
+        allowed = _CHOICES[(model_cls, field)]
+        valid_data = _VALID_PAYLOADS[model_cls]
+        if field in valid_data:
+            assert valid_data[field] in allowed
+        
+        rejected = [value for value in _INVALID_CHOICE_VALUES if value not in allowed]
+        assert rejected, f"Every fuzz value is a valid {field}"
+        
+        # The choice set comes from the models themselves, so every value goes through pydantic
+        adapter = _ADAPTERS[model_cls]
+        for value in allowed:
+            adapter.validate_python({**valid_data, field: value})
+        for value in rejected:
+            with pytest.raises(ValidationError):
+                adapter.validate_python({**valid_data, field: value})
     
-    def test_adjustment_schema_parity(self):
-        """Test Adjustment schema parity."""
-        valid_data = {
-            "id": "adjustment123",
-            "program_id": "program123",
-            "check_in_id": "checkin123",
-            "type": "calorie_adjustment",
-            "value": -150,
-            "reason": "Weight loss plateau detected",
-            "confidence": 0.85,
-            "applied": True,
-            "created_at": "2024-01-01T00:00:00Z"
-        }
-        
-        # Should validate successfully
-        adjustment = Adjustment(**valid_data)
-        assert adjustment.id == valid_data["id"]
-        assert adjustment.type == valid_data["type"]
-        
-        # Test invalid confidence value
-        invalid_data = valid_data.copy()
-        invalid_data["confidence"] = 1.5  # Should be 0-1
+    def test_choice_fields_found(self):
+        """Test that the models expose Enum/Literal fields, so the choice checks are not vacuous."""
+        assert _CHOICES, "No Enum or Literal fields found on the contract models"
+    
+    def test_user_profile_in_openapi(self, openapi_components):
+        """Test that UserProfile is published in the OpenAPI components."""
+        assert "UserProfile" in openapi_components
+    
+    @pytest.mark.parametrize("model_cls, valid_data, mutation", [
+        pytest.param(UserProfile, _USER_PROFILE_VALID, {"email": "invalid-email"}, id="UserProfile-email"),
+        pytest.param(HealthProfile, _HEALTH_PROFILE_VALID, {"parq_risk_level": "invalid_level"}, id="HealthProfile-parq_risk_level"),
+        pytest.param(Program, _PROGRAM_VALID, {"status": "invalid_status"}, id="Program-status"),
+        pytest.param(MacroTargets, _MACRO_TARGETS_VALID, {"calories": -100}, id="MacroTargets-calories"),
+        pytest.param(
+            Workout, _WORKOUT_VALID,
+            {"exercises": [{**_WORKOUT_VALID["exercises"][0], "sets": -1}]},
+            id="Workout-exercise_sets"
+        ),
+        pytest.param(
+            MealPlan, _MEAL_PLAN_VALID,
+            {"meals": [{**_MEAL_PLAN_VALID["meals"][0], "type": "invalid_type"}]},
+            id="MealPlan-meal_type"
+        ),
+        pytest.param(CheckIn, _CHECK_IN_VALID, {"sleep_quality": 15}, id="CheckIn-sleep_quality"),  # Should be 1-10
+        pytest.param(Adjustment, _ADJUSTMENT_VALID, {"confidence": 1.5}, id="Adjustment-confidence"),  # Should be 0-1
+    ])
+    def test_schema_parity(self, model_cls, valid_data, mutation):
+        """Test that valid data round-trips and a single invalid field is rejected."""
+        # Trusted test data: construct without validating (covered by test_valid_data_validates)
+        model = model_cls.model_construct(**valid_data)
+        for field in valid_data.keys() & model_cls.model_fields.keys():
+            assert getattr(model, field) == valid_data[field]
+        
+        # Test invalid data; the mutation replaces whole top-level fields, so valid_data is untouched
+        invalid_data = {**valid_data, **mutation}
         
         with pytest.raises(ValidationError):
-            Adjustment(**invalid_data)
+            _ADAPTERS[model_cls].validate_python(invalid_data)
 
 class TestAPIEndpointSchemas:
     """Test that API endpoints use correct schemas."""
@@ -281,17 +283,7 @@ class TestAPIEndpointSchemas:
         # This would test the actual API endpoint schema
         # For now, we'll test the request/response models
         
-        valid_request = {
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
-            "age": 30,
-            "weight_kg": 75.0,
-            "height_cm": 175,
-            "is_male": True,
-            "activity_level": "moderately_active",
-            "goal": "weight_loss"
-        }
+        valid_request = _USER_PROFILE_REQUEST
         
         # Should validate successfully
         user_profile = UserProfile(**valid_request)
@@ -344,15 +336,9 @@ class TestSchemaValidation:
         """Test that field types are correctly enforced."""
         # Test with wrong types
         invalid_data = {
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
+            **_USER_PROFILE_REQUEST,
             "age": "thirty",  # Should be int
-            "weight_kg": "75.0",  # Should be float
-            "height_cm": 175,
-            "is_male": True,
-            "activity_level": "moderately_active",
-            "goal": "weight_loss"
+            "weight_kg": "75.0"  # Should be float
         }
         
         with pytest.raises(ValidationError) as exc_info:
@@ -366,13 +352,7 @@ class TestSchemaValidation:
         """Test that enum values are correctly enforced."""
         # Test with invalid enum values
         invalid_data = {
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
-            "age": 30,
-            "weight_kg": 75.0,
-            "height_cm": 175,
-            "is_male": True,
+            **_USER_PROFILE_REQUEST,
             "activity_level": "invalid_activity",  # Invalid enum
             "goal": "invalid_goal"  # Invalid enum
         }
@@ -388,15 +368,10 @@ class TestSchemaValidation:
         """Test that field constraints are enforced."""
         # Test with values outside constraints
         invalid_data = {
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
+            **_USER_PROFILE_REQUEST,
             "age": -5,  # Should be positive
             "weight_kg": -50.0,  # Should be positive
-            "height_cm": 0,  # Should be positive
-            "is_male": True,
-            "activity_level": "moderately_active",
-            "goal": "weight_loss"
+            "height_cm": 0  # Should be positive
         }
         
         with pytest.raises(ValidationError) as exc_info:
@@ -413,17 +388,7 @@ class TestSchemaCompatibility:
     def test_backward_compatibility(self):
         """Test that schemas maintain backward compatibility."""
         # Test with minimal required fields
-        minimal_data = {
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
-            "age": 30,
-            "weight_kg": 75.0,
-            "height_cm": 175,
-            "is_male": True,
-            "activity_level": "moderately_active",
-            "goal": "weight_loss"
-        }
+        minimal_data = _USER_PROFILE_REQUEST
         
         # Should always work
         user_profile = UserProfile(**minimal_data)
@@ -432,15 +397,7 @@ class TestSchemaCompatibility:
     def test_forward_compatibility(self):
         """Test that schemas handle additional fields gracefully."""
         extended_data = {
-            "email": "test@example.com",
-            "first_name": "John",
-            "last_name": "Doe",
-            "age": 30,
-            "weight_kg": 75.0,
-            "height_cm": 175,
-            "is_male": True,
-            "activity_level": "moderately_active",
-            "goal": "weight_loss",
+            **_USER_PROFILE_REQUEST,
             "extra_field": "should_be_ignored",  # Extra field
             "another_field": 123  # Another extra field
         }
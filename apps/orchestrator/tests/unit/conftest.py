@@ -0,0 +1,14 @@
+"""
+Shared pytest setup for the orchestrator unit tests.
+"""
+import sys
+from pathlib import Path
+
+_ORCHESTRATOR_DIR = Path(__file__).resolve().parents[2]
+_REPO_ROOT = _ORCHESTRATOR_DIR.parents[1]
+
+# Service tests import through apps.orchestrator.app, while main.py and the API
+# modules import app like the server does; both roots resolve from any directory
+for _path in (str(_REPO_ROOT), str(_ORCHESTRATOR_DIR)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
@@ -0,0 +1,94 @@
+"""
+Unit tests for the batch program endpoint.
+Imports the app through the same root as main.py; tests/conftest.py puts it on sys.path.
+"""
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.api.v1.endpoints.programs import MAX_BATCH_PROFILES, MAX_PROGRAM_WEEKS
+from app.core.config import settings
+from main import create_application
+
+BATCH_URL = "/api/v1/programs/batch"
+
+PROFILES = [
+    {"user_id": "user-1", "experience_level": "beginner", "goal": "improve_fitness"},
+    {"user_id": "user-2", "experience_level": "intermediate", "goal": "gain_muscle", "training_days_per_week": 6},
+    {"user_id": "user-3", "experience_level": "advanced", "goal": "strength", "training_days_per_week": 4},
+]
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client whose app runs its lifespan, with a small worker pool."""
+    monkeypatch.setattr(settings, "PROGRAM_POOL_WORKERS", 2)
+    with TestClient(create_application()) as test_client:
+        yield test_client
+
+@pytest.fixture
+def auth_headers():
+    token = jwt.encode({"sub": "user-1"}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+class TestProgramsBatchEndpoint:
+    """POST /programs/batch."""
+    
+    def test_generates_one_program_per_profile_in_order(self, client, auth_headers):
+        """Programs come back in request order with one split per week."""
+        response = client.post(BATCH_URL, json={"profiles": PROFILES, "program_weeks": 8}, headers=auth_headers)
+        
+        assert response.status_code == 200
+        programs = response.json()
+        assert len(programs) == len(PROFILES)
+        assert all(len(program) == 8 for program in programs)
+        assert programs[0][0]["name"].startswith("Week 1")
+        assert programs[1][0]["days_per_week"] != programs[0][0]["days_per_week"]
+    
+    def test_pool_started_lazily(self, client, auth_headers):
+        """No worker processes exist until the first batch request."""
+        assert client.app.state.program_pool is None
+        
+        client.post(BATCH_URL, json={"profiles": PROFILES[:1]}, headers=auth_headers)
+        
+        assert client.app.state.program_pool is not None
+    
+    def test_requires_token(self, client):
+        """Requests without a bearer token are rejected."""
+        response = client.post(BATCH_URL, json={"profiles": PROFILES})
+        
+        assert response.status_code == 403
+    
+    def test_rejects_invalid_token(self, client):
+        """Tokens not signed with the app's key are rejected."""
+        token = jwt.encode({"sub": "user-1"}, "wrong-key", algorithm=settings.ALGORITHM)
+        response = client.post(BATCH_URL, json={"profiles": PROFILES},
+                               headers={"Authorization": f"Bearer {token}"})
+        
+        assert response.status_code == 401
+    
+    @pytest.mark.parametrize("body", [
+        {"profiles": []},
+        {"profiles": [PROFILES[0]] * (MAX_BATCH_PROFILES + 1)},
+        {"profiles": PROFILES, "program_weeks": 0},
+        {"profiles": PROFILES, "program_weeks": MAX_PROGRAM_WEEKS + 1},
+    ])
+    def test_rejects_unbounded_batches(self, client, auth_headers, body):
+        """Batch size and program length are bounded."""
+        response = client.post(BATCH_URL, json=body, headers=auth_headers)
+        
+        assert response.status_code == 422
+    
+    @pytest.mark.parametrize("profile", [
+        "not-a-profile",
+        {"user_id": "user-1", "training_days_per_week": "six"},
+        {"user_id": "user-1", "training_days_per_week": 9},
+        {"user_id": "user-1", "experience_level": ["beginner"]},
+    ])
+    def test_rejects_malformed_profiles(self, client, auth_headers, profile):
+        """A malformed profile is a validation error, not a worker failure."""
+        response = client.post(BATCH_URL, json={"profiles": [PROFILES[0], profile]}, headers=auth_headers)
+        
+        assert response.status_code == 422
+        assert client.app.state.program_pool is None
@@ -0,0 +1,207 @@
+"""
+Unit tests for the safety regression tests service.
+"""
+import pytest
+import time
+from apps.orchestrator.app.services.safety_tests import (
+    SafetyTestsService,
+    SafetyTestResult,
+    TestType as ResultType,
+    TestStatus as ResultStatus,
+    RiskLevel,
+    _NS_PER_DAY
+)
+
+USER_ID = "user-1"
+PROGRAM_ID = "program-1"
+
+CLEAR_PARQ = {
+    "chest_pain": False,
+    "chest_pain_activity": False,
+    "chest_pain_recent": False,
+    "balance_problems": False,
+    "bone_problems": False,
+    "blood_pressure_meds": False,
+    "other_reasons": False,
+    "age": 30,
+    "medical_conditions": [],
+    "medications": []
+}
+
+def _comparable(result: SafetyTestResult):
+    """Fields that must agree between two runs, ignoring the timestamp."""
+    return (
+        result.test_type, result.test_name, result.status,
+        result.risk_level, result.description, result.details
+    )
+
+class TestContraindicationBatch:
+    """The packed-bit batch path must match the per-exercise path."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = SafetyTestsService()
+    
+    async def _run_both(self, exercises, injuries, conditions, medications):
+        scalar = await self.service.run_contraindication_tests(USER_ID, PROGRAM_ID, [
+            {
+                "exercise_name": exercise,
+                "user_injuries": injuries,
+                "user_conditions": conditions,
+                "user_medications": medications
+            }
+            for exercise in exercises
+        ])
+        batch = await self.service.run_contraindication_tests_batch(
+            USER_ID, PROGRAM_ID, exercises, injuries, conditions, medications
+        )
+        return scalar, batch
+    
+    @pytest.mark.asyncio
+    async def test_matches_scalar_path(self):
+        """Conflicts, ordering, duplicates and unknown exercises agree with the scalar path."""
+        exercises = [
+            "squat", "bench_press", "unknown_exercise", "squat",
+            "heavy_lifting", "high_intensity", "deadlift", "unknown_exercise"
+        ]
+        injuries = ["knee_pain", "lower_back_pain", "unknown_injury"]
+        conditions = ["heart_condition", "hypertension"]
+        medications = ["beta_blockers"]
+        
+        scalar, batch = await self._run_both(exercises, injuries, conditions, medications)
+        
+        assert [_comparable(r) for r in batch] == [_comparable(r) for r in scalar]
+        assert [r.details["exercise"] for r in batch] == exercises
+    
+    @pytest.mark.asyncio
+    async def test_conflicts_follow_user_order(self):
+        """Conflict lists keep the user's ordering rather than the rule table's."""
+        _, batch = await self._run_both(
+            ["heavy_lifting"], [], ["hypertension", "heart_condition"], []
+        )
+        
+        assert batch[0].details["condition_conflicts"] == ["hypertension", "heart_condition"]
+        assert batch[0].status is ResultStatus.FAILED
+        assert batch[0].risk_level is RiskLevel.HIGH
+    
+    @pytest.mark.asyncio
+    async def test_no_profile_factors(self):
+        """An empty profile passes every exercise, known or not."""
+        scalar, batch = await self._run_both(["squat", "unknown_exercise"], [], [], [])
+        
+        assert [_comparable(r) for r in batch] == [_comparable(r) for r in scalar]
+        assert all(r.status is ResultStatus.PASSED for r in batch)
+    
+    @pytest.mark.asyncio
+    async def test_pass_results_do_not_share_details(self):
+        """Each passed result owns its details dict."""
+        _, batch = await self._run_both(["squat", "bench_press"], [], [], [])
+        
+        assert batch[0].details is not batch[1].details
+
+class TestRunAllSafetyTests:
+    """Fail-fast behaviour of the full safety battery."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = SafetyTestsService()
+        self.test_data = {
+            "parq_data": {**CLEAR_PARQ, "chest_pain": True},
+            "contraindication_data": [
+                {"exercise_name": "squat", "user_injuries": ["knee_pain"]}
+            ],
+            "deload_data": {"fatigue_level": 9}
+        }
+    
+    @pytest.mark.asyncio
+    async def test_critical_parq_skips_remaining_suites(self):
+        """A critical PAR-Q failure runs only the safety gate afterwards."""
+        results = await self.service.run_all_safety_tests(USER_ID, PROGRAM_ID, self.test_data)
+        test_types = {result.test_type for result in results}
+        
+        assert ResultType.CONTRAINDICATIONS not in test_types
+        assert ResultType.DELOAD_TRIGGERS not in test_types
+        assert any(
+            result.test_name == "Critical Safety Gate" and result.status is ResultStatus.FAILED
+            for result in results
+        )
+    
+    @pytest.mark.asyncio
+    async def test_always_run_all_runs_every_suite(self):
+        """Audits still get the full battery when PAR-Q fails."""
+        results = await self.service.run_all_safety_tests(
+            USER_ID, PROGRAM_ID, self.test_data, always_run_all=True
+        )
+        test_types = {result.test_type for result in results}
+        
+        assert test_types == set(ResultType)
+        assert any(result.test_name == "Critical Safety Gate" for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_clear_parq_runs_every_suite(self):
+        """Without a critical failure nothing is skipped."""
+        test_data = {**self.test_data, "parq_data": CLEAR_PARQ}
+        results = await self.service.run_all_safety_tests(USER_ID, PROGRAM_ID, test_data)
+        
+        assert {result.test_type for result in results} == set(ResultType)
+
+class TestResultStorage:
+    """Retention of stored results."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = SafetyTestsService()
+    
+    def _result(self, timestamp: int) -> SafetyTestResult:
+        return SafetyTestResult(
+            test_type=ResultType.SAFETY_GATES,
+            test_name="Overall Safety Assessment",
+            status=ResultStatus.PASSED,
+            risk_level=RiskLevel.LOW,
+            description="",
+            details={},
+            timestamp=timestamp,
+            user_id=USER_ID,
+            program_id=PROGRAM_ID
+        )
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_only_expired_results(self):
+        """Expired results are dropped from the left of the deque; recent ones stay in order."""
+        now = time.time_ns()
+        timestamps = [now - 120 * _NS_PER_DAY, now - 91 * _NS_PER_DAY, now - 10 * _NS_PER_DAY, now]
+        self.service.test_results.extend(self._result(ts) for ts in timestamps)
+        
+        await self.service.cleanup_old_results(days_to_keep=90)
+        
+        assert [r.timestamp for r in self.service.test_results] == timestamps[2:]
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_invalidates_export_cache(self):
+        """An export after cleanup no longer contains the removed results."""
+        now = time.time_ns()
+        self.service.test_results.extend([self._result(now - 100 * _NS_PER_DAY), self._result(now)])
+        self.service._results_version += 1
+        
+        before = await self.service.export_test_results()
+        await self.service.cleanup_old_results(days_to_keep=90)
+        after = await self.service.export_test_results()
+        
+        assert before != after
+        assert after.count('"test_name"') == 1
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_with_nothing_expired(self):
+        """A cleanup that removes nothing keeps every result."""
+        now = time.time_ns()
+        self.service.test_results.extend([self._result(now), self._result(now)])
+        
+        await self.service.cleanup_old_results(days_to_keep=90)
+        
+        assert len(self.service.test_results) == 2
+
+def test_enums_do_not_compare_equal_across_types():
+    """Members of different result enums never compare equal."""
+    assert ResultType.PAR_Q_SCREENING != ResultStatus.PASSED
+    assert ResultStatus.PASSED != RiskLevel.LOW
+    assert len({*ResultType, *ResultStatus, *RiskLevel}) == len(ResultType) + len(ResultStatus) + len(RiskLevel)
@@ -0,0 +1,297 @@
+"""
+Unit tests for the schedule optimizer.
+"""
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time
+from apps.orchestrator.app.services import schedule_optimizer
+from apps.orchestrator.app.services.schedule_optimizer import (
+    ScheduleOptimizer,
+    ScheduleConstraint,
+    ScheduledActivity,
+    ScheduleRequest,
+    UserPreferences,
+    ActivityType,
+    TimeSlot
+)
+
+WEEK_START = datetime(2024, 1, 1)  # A Monday
+
+def _preferences() -> UserPreferences:
+    return UserPreferences(
+        user_id="user-1",
+        wake_up_time=time(6, 0),
+        bed_time=time(22, 0),
+        work_start_time=time(9, 0),
+        work_end_time=time(17, 0),
+        preferred_workout_time=TimeSlot.AFTERNOON,
+        preferred_meal_times={},
+        rest_days=[]
+    )
+
+def _constraint(**overrides) -> ScheduleConstraint:
+    fields = dict(
+        id="workout",
+        user_id="user-1",
+        activity_type=ActivityType.WORKOUT,
+        preferred_time_slots=[TimeSlot.AFTERNOON],
+        preferred_days=[1],
+        duration_minutes=60,
+        frequency_per_week=1,
+        priority=5
+    )
+    fields.update(overrides)
+    return ScheduleConstraint(**fields)
+
+def _existing(start: time, end: time, day: datetime = WEEK_START) -> ScheduledActivity:
+    return ScheduledActivity(
+        id="existing",
+        user_id="user-1",
+        activity_type=ActivityType.HABIT,
+        title="Existing",
+        description="",
+        scheduled_date=day,
+        start_time=start,
+        end_time=end,
+        duration_minutes=0,
+        constraint_id="existing",
+        priority=1,
+        metadata={}
+    )
+
+def _summary_of(scheduled_activities, conflicts):
+    return (
+        [(a.scheduled_date, a.start_time, a.end_time) for a in scheduled_activities],
+        [c["constraint_id"] for c in conflicts]
+    )
+
+@pytest.fixture
+def greedy_only(monkeypatch):
+    """Run the optimizer as if OR-Tools were not installed."""
+    monkeypatch.setattr(schedule_optimizer, "cp_model", None)
+
+class TestSolverAgreement:
+    """CP-SAT and the greedy scheduler must see existing activities the same way."""
+    
+    def _optimize(self, constraints, existing):
+        return ScheduleOptimizer().optimize_schedule(
+            "user-1", WEEK_START, constraints, _preferences(), existing
+        )
+    
+    def _solve_both(self, constraints, existing):
+        """Run one input through the CP-SAT model and the greedy scheduler directly."""
+        optimizer = ScheduleOptimizer()
+        optimizer.CP_SAT_TIME_LIMIT_SECONDS = 5.0  # Keep a loaded test machine from timing out
+        occupied = optimizer._build_occupancy(existing, WEEK_START)
+        slots, slot_index = optimizer._generate_available_slots(WEEK_START, _preferences(), occupied)
+        cp_solution = optimizer._solve_cp_model(constraints, slots, WEEK_START, existing)
+        greedy_solution = optimizer._schedule_greedy(constraints, slots, slot_index, _preferences())
+        return cp_solution, greedy_solution
+    
+    @pytest.mark.parametrize("existing", [
+        [_existing(time(10, 0), time(10, 0))],  # Zero-length
+        [_existing(time(12, 30), time(13, 0))],  # Overlaps the only afternoon slot
+        [_existing(time(23, 0), time(1, 0), datetime(2023, 12, 31))],  # Spills into the week
+        [_existing(time(9, 0), time(11, 0))],
+    ])
+    def test_same_input_same_outcome(self, existing):
+        """One input through both solvers schedules the same activities and conflicts."""
+        if schedule_optimizer.cp_model is None:
+            pytest.skip("OR-Tools is not installed")
+        
+        cp_solution, greedy_solution = self._solve_both([_constraint()], existing)
+        
+        assert cp_solution is not None
+        assert _summary_of(*cp_solution) == _summary_of(*greedy_solution)
+    
+    def test_zero_length_existing_activity_blocks_nothing(self):
+        """A 10:00-10:00 activity on Monday leaves Monday afternoon free."""
+        result = self._optimize([_constraint()], [_existing(time(10, 0), time(10, 0))])
+        
+        assert result.conflicts == []
+        assert result.scheduled_activities[0].scheduled_date == WEEK_START
+        assert result.scheduled_activities[0].start_time == time(12, 0)
+
+class TestCPSATFallback:
+    """CP-SAT only runs, and only wins, when greedy leaves conflicts."""
+    
+    # Greedy gives the afternoon to the high-priority constraint and strands the other;
+    # CP-SAT moves the high-priority one to the morning
+    CONSTRAINTS = [
+        _constraint(id="flexible", priority=5, preferred_time_slots=[TimeSlot.MORNING, TimeSlot.AFTERNOON]),
+        _constraint(id="afternoon_only", priority=3),
+    ]
+    
+    def _optimizer(self, monkeypatch):
+        calls = []
+        original = ScheduleOptimizer._solve_cp_model
+        
+        def spy(self, *args, **kwargs):
+            calls.append(args)
+            return original(self, *args, **kwargs)
+        
+        monkeypatch.setattr(ScheduleOptimizer, "_solve_cp_model", spy)
+        optimizer = ScheduleOptimizer()
+        optimizer.CP_SAT_TIME_LIMIT_SECONDS = 5.0
+        return optimizer, calls
+    
+    def test_not_run_when_greedy_places_everything(self, monkeypatch):
+        """A conflict-free greedy schedule is returned without a CP-SAT search."""
+        optimizer, calls = self._optimizer(monkeypatch)
+        
+        result = optimizer.optimize_schedule("user-1", WEEK_START, [_constraint()], _preferences())
+        
+        assert calls == []
+        assert result.conflicts == []
+    
+    def test_resolves_greedy_conflicts(self, monkeypatch):
+        """When greedy strands an instance, the CP-SAT packing replaces it."""
+        if schedule_optimizer.cp_model is None:
+            pytest.skip("OR-Tools is not installed")
+        optimizer, calls = self._optimizer(monkeypatch)
+        
+        result = optimizer.optimize_schedule("user-1", WEEK_START, self.CONSTRAINTS, _preferences())
+        
+        assert len(calls) == 1
+        assert result.conflicts == []
+        assert {a.constraint_id: a.start_time for a in result.scheduled_activities} == {
+            "flexible": time(8, 0), "afternoon_only": time(12, 0)
+        }
+    
+    def test_greedy_conflicts_kept_without_cp_sat(self, greedy_only):
+        """Without OR-Tools the greedy schedule and its conflicts are returned."""
+        result = ScheduleOptimizer().optimize_schedule("user-1", WEEK_START, self.CONSTRAINTS, _preferences())
+        
+        assert [a.constraint_id for a in result.scheduled_activities] == ["flexible"]
+        assert [c["constraint_id"] for c in result.conflicts] == ["afternoon_only"]
+
+class TestGreedyFallback:
+    """Scheduling without OR-Tools."""
+    
+    def test_greedy_used_without_cp_sat(self, greedy_only, monkeypatch):
+        """Without OR-Tools the greedy scheduler produces the schedule."""
+        calls = []
+        original = ScheduleOptimizer._schedule_greedy
+        
+        def spy(self, *args, **kwargs):
+            calls.append(args)
+            return original(self, *args, **kwargs)
+        
+        monkeypatch.setattr(ScheduleOptimizer, "_schedule_greedy", spy)
+        result = ScheduleOptimizer().optimize_schedule(
+            "user-1", WEEK_START, [_constraint(preferred_days=[1, 3, 5], frequency_per_week=3)],
+            _preferences()
+        )
+        
+        assert len(calls) == 1
+        assert len(result.scheduled_activities) == 3
+        assert result.conflicts == []
+    
+    def test_greedy_reports_unmet_frequency(self, greedy_only):
+        """Instances that do not fit are reported as a conflict."""
+        result = ScheduleOptimizer().optimize_schedule(
+            "user-1", WEEK_START, [_constraint(frequency_per_week=2)], _preferences()
+        )
+        
+        assert len(result.scheduled_activities) == 1
+        assert [c["constraint_id"] for c in result.conflicts] == ["workout"]
+
+class TestOptimizationCache:
+    """Cached optimizations are isolated from the copies returned to callers."""
+    
+    def test_mutating_result_does_not_change_cache(self):
+        """Editing a returned activity or its metadata leaves the cached entry intact."""
+        optimizer = ScheduleOptimizer()
+        args = ("user-1", WEEK_START, [_constraint()], _preferences())
+        
+        first = optimizer.optimize_schedule(*args)
+        first.scheduled_activities[0].title = "Changed"
+        first.scheduled_activities[0].metadata["time_slot"] = "night"
+        first.conflicts.append({"constraint_id": "extra"})
+        second = optimizer.optimize_schedule(*args)
+        
+        assert second.scheduled_activities[0].title == "Workout Session"
+        assert second.scheduled_activities[0].metadata["time_slot"] == "afternoon"
+        assert second.conflicts == []
+        assert second.scheduled_activities[0] is not first.scheduled_activities[0]
+
+class TestWorkoutTiming:
+    """Device-data analysis behind get_optimal_workout_timing."""
+    
+    def test_sleep_quality_scaled_to_unit_range(self):
+        """1-10 sleep quality is compared on the same 0-1 scale as the defaults."""
+        device_data = [
+            {'timestamp': datetime(2024, 1, 1, 9, 0), 'sleep_quality': 7},
+            {'timestamp': datetime(2024, 1, 1, 10, 0), 'sleep_quality': 9},
+        ]
+        
+        result = ScheduleOptimizer().get_optimal_workout_timing("user-1", device_data, _preferences())
+        
+        morning = next(slot for slot in result['optimal_slots'] if slot['time_slot'] == 'morning')
+        assert morning['sleep_score'] == pytest.approx(0.8)
+        assert all(0 <= slot['score'] <= 1 for slot in result['optimal_slots'])
+    
+    def test_samples_without_timestamp_skipped(self):
+        """Samples lacking a timestamp are ignored instead of raising."""
+        device_data = [
+            {'heart_rate': 80},
+            {'timestamp': "2024-01-01T18:00:00", 'heart_rate': 120, 'steps': 3000},
+            {'timestamp': None, 'steps': 10},
+        ]
+        
+        result = ScheduleOptimizer().get_optimal_workout_timing("user-1", device_data, _preferences())
+        
+        assert result['optimal_slots']
+
+class TestScheduleBatch:
+    """Batch optimization across worker processes."""
+    
+    def _requests(self):
+        return [
+            ScheduleRequest(
+                user_id=f"user-{day}",
+                week_start=WEEK_START,
+                constraints=[_constraint(user_id=f"user-{day}", preferred_days=[day])],
+                preferences=_preferences()
+            )
+            for day in range(1, 8)
+        ]
+    
+    def _expected(self, requests):
+        optimizer = ScheduleOptimizer()
+        return [
+            self._summary(optimizer.optimize_schedule(
+                request.user_id, request.week_start, request.constraints, request.preferences
+            ))
+            for request in requests
+        ]
+    
+    def _summary(self, optimization):
+        return _summary_of(optimization.scheduled_activities, optimization.conflicts)
+    
+    def test_uses_given_executor(self):
+        """Results from a caller-owned pool match in-process optimization, in order."""
+        requests = self._requests()
+        
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = ScheduleOptimizer().optimize_schedules_batch(requests, executor=executor)
+        
+        assert [self._summary(r) for r in results] == self._expected(requests)
+    
+    def test_shared_pool_reused_across_batches(self, monkeypatch):
+        """Batches without an executor share one lazily started pool."""
+        monkeypatch.setattr(schedule_optimizer, "_batch_pool", None)
+        optimizer = ScheduleOptimizer()
+        requests = self._requests()
+        
+        try:
+            optimizer.optimize_schedules_batch(requests)
+            pool = schedule_optimizer._batch_pool
+            results = optimizer.optimize_schedules_batch(requests)
+            
+            assert pool is not None
+            assert schedule_optimizer._batch_pool is pool
+            assert [self._summary(r) for r in results] == self._expected(requests)
+        finally:
+            if schedule_optimizer._batch_pool is not None:
+                schedule_optimizer._batch_pool.shutdown()
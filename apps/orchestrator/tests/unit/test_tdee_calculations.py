@@ -377,3 +377,105 @@ class TestIntegration:
             
             total_calories = protein_calories + fat_calories + carb_calories
             assert abs(total_calories - macros.calories) < 50, f"Calorie mismatch for {scenario['name']}"
+
+VALID_PROFILE = {
+    "user_id": "user-1",
+    "age": 30,
+    "weight_kg": 80,
+    "height_cm": 180,
+    "sex_at_birth": "male",
+    "activity_level": "moderate",
+    "goal": "lose_weight",
+    "experience_level": "intermediate"
+}
+
+INVALID_PROFILES = [
+    {**VALID_PROFILE, "age": None},
+    {**VALID_PROFILE, "weight_kg": None},
+    {**VALID_PROFILE, "height_cm": None},
+    {**VALID_PROFILE, "sex_at_birth": None},
+    {**VALID_PROFILE, "weight_kg": 0},
+    {key: value for key, value in VALID_PROFILE.items() if key != "height_cm"},
+]
+
+def _tdee_batch(engine, profiles):
+    """Run profiles through calculate_tdee_batch as parallel sequences."""
+    return engine.calculate_tdee_batch(
+        [profile.get("age") for profile in profiles],
+        [profile.get("weight_kg") for profile in profiles],
+        [profile.get("height_cm") for profile in profiles],
+        [profile.get("sex_at_birth") for profile in profiles],
+        [profile.get("activity_level") for profile in profiles],
+        [profile.get("goal") for profile in profiles]
+    )
+
+class TestTDEEBatch:
+    """The batch TDEE path must agree with calculate_tdee, including on bad input."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = TDEEMacroEngine()
+    
+    def test_matches_scalar_path(self):
+        """Valid profiles give the same results through both paths."""
+        profiles = [
+            VALID_PROFILE,
+            {**VALID_PROFILE, "sex_at_birth": "female", "activity_level": "very_active", "goal": "gain_muscle"},
+            {**VALID_PROFILE, "weight_kg": 45, "height_cm": 150, "goal": "lose_weight_aggressive"},
+        ]
+        
+        batch = _tdee_batch(self.engine, profiles)
+        
+        for index, profile in enumerate(profiles):
+            scalar = self.engine.calculate_tdee(profile)
+            assert batch['bmr'][index] == scalar.bmr
+            assert batch['tdee'][index] == scalar.tdee
+            assert batch['final_target'][index] == scalar.final_target
+    
+    @pytest.mark.parametrize("invalid_profile", INVALID_PROFILES)
+    def test_invalid_input_rejected_like_scalar(self, invalid_profile):
+        """Missing values raise the same ValueError on both paths instead of clamped targets."""
+        with pytest.raises(ValueError) as scalar_error:
+            self.engine.calculate_tdee(invalid_profile)
+        
+        with pytest.raises(ValueError) as batch_error:
+            _tdee_batch(self.engine, [VALID_PROFILE, invalid_profile])
+        
+        assert str(batch_error.value) == str(scalar_error.value)
+    
+    def test_nan_rejected(self):
+        """NaN inputs are treated as missing."""
+        with pytest.raises(ValueError):
+            self.engine.calculate_tdee_batch([30, float("nan")], [80, 80], [180, 180],
+                                             ["male", "male"], ["moderate"] * 2, ["maintain"] * 2)
+
+class TestMacroPlanBatch:
+    """plan_macros_batch must agree with plan_macros, including on bad input."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.engine = TDEEMacroEngine()
+    
+    def test_matches_scalar_path(self):
+        """Every user's weekly plan matches the per-profile plan."""
+        profiles = [
+            VALID_PROFILE,
+            {**VALID_PROFILE, "sex_at_birth": "female", "goal": "gain_muscle", "experience_level": "beginner"},
+            {**VALID_PROFILE, "activity_level": "very_active", "goal": "maintain", "experience_level": "advanced"},
+            {**VALID_PROFILE, "weight_kg": 110, "goal": "lose_weight", "experience_level": "beginner"},
+        ]
+        
+        batch = self.engine.plan_macros_batch(profiles, program_weeks=12)
+        
+        assert batch == [self.engine.plan_macros(profile, program_weeks=12) for profile in profiles]
+    
+    @pytest.mark.parametrize("invalid_profile", INVALID_PROFILES)
+    def test_invalid_profile_rejected_like_scalar(self, invalid_profile):
+        """A missing value anywhere in the batch raises instead of producing garbage targets."""
+        with pytest.raises(ValueError) as scalar_error:
+            self.engine.plan_macros(invalid_profile)
+        
+        with pytest.raises(ValueError) as batch_error:
+            self.engine.plan_macros_batch([VALID_PROFILE, invalid_profile])
+        
+        assert str(batch_error.value) == str(scalar_error.value)
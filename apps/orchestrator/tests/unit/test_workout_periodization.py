@@ -0,0 +1,33 @@
+"""
+Unit tests for workout periodization.
+"""
+import pytest
+from apps.orchestrator.app.services.workout_periodization import (
+    WorkoutPeriodization,
+    generate_programs_in_worker
+)
+
+PROFILES = [
+    {"user_id": "user-1", "experience_level": "beginner", "goal": "improve_fitness"},
+    {"user_id": "user-2", "experience_level": "intermediate", "goal": "gain_muscle", "training_days_per_week": 6},
+    {"user_id": "user-3", "experience_level": "advanced", "goal": "strength", "training_days_per_week": 4},
+    {"user_id": "user-1", "experience_level": "beginner", "goal": "improve_fitness"},
+]
+
+class TestProgramBatch:
+    """Batch program generation must match per-profile generation."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.periodization = WorkoutPeriodization()
+    
+    @pytest.mark.parametrize("program_weeks", [1, 12, 16])
+    def test_batch_matches_scalar_path(self, program_weeks):
+        """Every program, including duplicates, matches generate_program in request order."""
+        batch = self.periodization.generate_programs_batch(PROFILES, program_weeks)
+        
+        assert batch == [self.periodization.generate_program(profile, program_weeks) for profile in PROFILES]
+    
+    def test_worker_entry_point_uses_batch(self):
+        """The worker entry point returns the same programs as the batch method."""
+        assert generate_programs_in_worker(PROFILES, 8) == self.periodization.generate_programs_batch(PROFILES, 8)